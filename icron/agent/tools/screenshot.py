@@ -1,33 +1,73 @@
 """Screenshot tool using Playwright for browser automation."""
 
+import functools
 import hashlib
+import re
 from datetime import datetime
 from pathlib import Path
-from typing import Any
-from urllib.parse import urlparse
+from typing import Any, NamedTuple
 
 from icron.agent.tools.base import Tool
 
+ADA_AVAILABLE = False
+try:
+    from ada_url import parse_url as _ada_parse_url
+    ADA_AVAILABLE = True
+except ImportError:
+    pass
 
+# Scheme and authority only; the rest of the URL is left to the browser
+_URL_RE = re.compile(r"^(?P<scheme>[a-z][a-z0-9+.-]*):(?://(?P<host>[^/?#]*))?", re.IGNORECASE)
+
+
+@functools.lru_cache(maxsize=1024)
 def _validate_url(url: str) -> tuple[bool, str]:
     """
     Validate URL format for screenshot capture.
 
+    The scheme and host are checked with a regex; when ada-url is installed the
+    whole URL is additionally parsed per the WHATWG URL standard. Surrounding
+    whitespace is ignored, as urlsplit and browsers do.
+
     Args:
         url: The URL to validate.
 
     Returns:
         Tuple of (is_valid, error_message). Error message is empty if valid.
     """
-    try:
-        parsed = urlparse(url)
-        if parsed.scheme not in ('http', 'https'):
-            return False, f"Only http/https allowed, got '{parsed.scheme or 'none'}'"
-        if not parsed.netloc:
-            return False, "Missing domain"
-        return True, ""
-    except Exception as e:
-        return False, str(e)
+    url = url.strip()
+    match = _URL_RE.match(url)
+    scheme = match["scheme"].lower() if match else ""
+    if scheme not in ('http', 'https'):
+        return False, f"Only http/https allowed, got '{scheme or 'none'}'"
+    if not match["host"]:
+        return False, "Missing domain"
+    if ADA_AVAILABLE:
+        try:
+            _ada_parse_url(url, attributes=("hostname",))
+        except ValueError:
+            return False, "Malformed URL"
+    return True, ""
+
+
+class ParamError(NamedTuple):
+    """A structured parameter validation error.
+
+    Compares equal to a plain (field, code) tuple. Codes are "missing",
+    "wrong_type", "below_min" and "above_max".
+    """
+
+    field: str
+    code: str
+
+
+# Message templates matching Tool's generic schema validation, keyed by error code
+_ERROR_MESSAGES = {
+    "missing": "missing required {field}",
+    "wrong_type": "{field} should be {type}",
+    "below_min": "{field} must be >= {minimum}",
+    "above_max": "{field} must be <= {maximum}",
+}
 
 
 def _generate_filename(url: str) -> str:
@@ -41,7 +81,7 @@ def _generate_filename(url: str) -> str:
         Filename in format: screenshot_{timestamp}_{url_hash}.png
     """
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    url_hash = hashlib.md5(url.encode()).hexdigest()[:8]
+    url_hash = hashlib.blake2b(url.encode(), digest_size=4).hexdigest()
     return f"screenshot_{timestamp}_{url_hash}.png"
 
 
@@ -88,6 +128,12 @@ class ScreenshotTool(Tool):
         "required": ["url"]
     }
 
+    # Flattened from parameters once: (name, python type, minimum, maximum)
+    _PARAM_CHECKS = tuple(
+        (name, Tool._TYPE_MAP[spec["type"]], spec.get("minimum"), spec.get("maximum"))
+        for name, spec in parameters["properties"].items()
+    )
+
     def __init__(self, workspace_path: str | None = None, timeout_ms: int = 30000) -> None:
         """
         Initialize the screenshot tool.
@@ -99,6 +145,55 @@ class ScreenshotTool(Tool):
         self.workspace_path = Path(workspace_path) if workspace_path else Path.cwd()
         self.timeout_ms = timeout_ms
 
+    def param_errors(self, params: dict[str, Any]) -> list[ParamError]:
+        """
+        Validate parameters against the flattened schema.
+
+        Booleans are rejected for integer fields.
+
+        Args:
+            params: Tool call arguments.
+
+        Returns:
+            List of structured errors (empty if valid).
+        """
+        errors = [ParamError(name, "missing") for name in self.parameters["required"]
+                  if name not in params]
+        for name, py_type, minimum, maximum in self._PARAM_CHECKS:
+            if name not in params:
+                continue
+            value = params[name]
+            if not isinstance(value, py_type) or (py_type is int and isinstance(value, bool)):
+                errors.append(ParamError(name, "wrong_type"))
+                continue
+            if minimum is not None and value < minimum:
+                errors.append(ParamError(name, "below_min"))
+            if maximum is not None and value > maximum:
+                errors.append(ParamError(name, "above_max"))
+        return errors
+
+    def validate_params(self, params: dict[str, Any]) -> list[str]:
+        """
+        Validate parameters, rendering param_errors as Tool-style messages.
+
+        Args:
+            params: Tool call arguments.
+
+        Returns:
+            List of error messages (empty if valid).
+        """
+        properties = self.parameters["properties"]
+        messages = []
+        for error in self.param_errors(params):
+            spec = properties.get(error.field, {})
+            messages.append(_ERROR_MESSAGES[error.code].format(
+                field=error.field,
+                type=spec.get("type"),
+                minimum=spec.get("minimum"),
+                maximum=spec.get("maximum"),
+            ))
+        return messages
+
     async def execute(
         self,
         url: str,
@@ -121,6 +216,7 @@ class ScreenshotTool(Tool):
             Success message with file path, or error message on failure.
         """
         # Validate URL
+        url = url.strip()
         is_valid, error_msg = _validate_url(url)
         if not is_valid:
             return f"Error: URL validation failed - {error_msg}"
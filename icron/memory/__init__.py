@@ -2,6 +2,7 @@
 
 from .store import MemoryStore
 from .index import VectorIndex, SearchResult
+from .cache import BaseEmbeddingCache, EmbeddingCache, RedisEmbeddingCache
 from .embeddings import (
     EmbeddingProvider,
     OpenAIEmbedding,
@@ -15,6 +16,9 @@ __all__ = [
     "MemoryStore",
     "VectorIndex",
     "SearchResult",
+    "BaseEmbeddingCache",
+    "EmbeddingCache",
+    "RedisEmbeddingCache",
     "EmbeddingProvider",
     "OpenAIEmbedding",
     "GeminiEmbedding",
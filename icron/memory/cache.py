@@ -0,0 +1,186 @@
+"""Content-addressed caches for embedding vectors.
+
+Keys are BLAKE2b digests of the text namespaced by model and dimension, so
+identical texts are only sent to an embedding backend once.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import struct
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Sequence
+
+
+def embedding_cache_key(namespace: str, text: str) -> bytes:
+    """Build a cache key for a text under a model namespace.
+
+    Args:
+        namespace: Identifies the model and dimension producing the vector.
+        text: The embedded text.
+
+    Returns:
+        16-byte BLAKE2b digest.
+    """
+    digest = hashlib.blake2b(namespace.encode("utf-8"), digest_size=16)
+    digest.update(b"\0")
+    digest.update(text.encode("utf-8"))
+    return digest.digest()
+
+
+class BaseEmbeddingCache(ABC):
+    """Interface shared by embedding caches."""
+
+    @abstractmethod
+    async def get_many(self, keys: Sequence[bytes]) -> list[Sequence[float] | None]:
+        """Look up vectors.
+
+        Args:
+            keys: Cache keys.
+
+        Returns:
+            Cached vector or None for each key, in order.
+        """
+
+    @abstractmethod
+    async def set_many(self, items: dict[bytes, Sequence[float]]) -> None:
+        """Store vectors.
+
+        Args:
+            items: Mapping of cache key to vector.
+        """
+
+    @abstractmethod
+    async def clear(self) -> None:
+        """Drop all cached vectors."""
+
+
+class EmbeddingCache(BaseEmbeddingCache):
+    """In-memory LRU cache of embedding vectors.
+
+    Attributes:
+        maxsize: Maximum number of vectors kept; 0 disables caching.
+    """
+
+    def __init__(self, maxsize: int = 4096) -> None:
+        """Initialize the cache.
+
+        Args:
+            maxsize: Maximum number of vectors kept; 0 disables caching.
+        """
+        self.maxsize = maxsize
+        self._entries: OrderedDict[bytes, Sequence[float]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def get_many(self, keys: Sequence[bytes]) -> list[Sequence[float] | None]:
+        """Look up vectors, refreshing their recency.
+
+        Args:
+            keys: Cache keys.
+
+        Returns:
+            Cached vector or None for each key, in order.
+        """
+        results: list[Sequence[float] | None] = []
+        for key in keys:
+            vector = self._entries.get(key)
+            if vector is not None:
+                self._entries.move_to_end(key)
+            results.append(vector)
+        return results
+
+    async def set_many(self, items: dict[bytes, Sequence[float]]) -> None:
+        """Store vectors, evicting the least recently used beyond maxsize.
+
+        Args:
+            items: Mapping of cache key to vector.
+        """
+        if self.maxsize <= 0:
+            return
+        for key, vector in items.items():
+            self._entries[key] = vector
+            self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    async def clear(self) -> None:
+        """Drop all cached vectors."""
+        self._entries.clear()
+
+
+class RedisEmbeddingCache(BaseEmbeddingCache):
+    """Embedding cache backed by Redis, shared across processes.
+
+    Requires the redis package: pip install redis
+    Vectors are stored as little-endian float32 bytes with a TTL.
+    """
+
+    def __init__(
+        self,
+        url: str = "redis://localhost:6379/0",
+        *,
+        ttl: int = 7 * 24 * 3600,
+        prefix: str = "icron:emb:",
+        client: Any | None = None,
+    ) -> None:
+        """Initialize the Redis cache.
+
+        Args:
+            url: Redis connection URL (ignored when client is given).
+            ttl: Expiry for cached vectors in seconds.
+            prefix: Key prefix for cache entries.
+            client: Existing redis.asyncio client to use.
+
+        Raises:
+            ImportError: If redis is not installed and no client is given.
+        """
+        if client is None:
+            try:
+                import redis.asyncio as redis_asyncio
+            except ImportError as e:
+                raise ImportError(
+                    "redis is required for RedisEmbeddingCache. Install with: pip install redis"
+                ) from e
+            client = redis_asyncio.from_url(url)
+        self._redis = client
+        self._ttl = ttl
+        self._prefix = prefix.encode("utf-8")
+
+    async def get_many(self, keys: Sequence[bytes]) -> list[Sequence[float] | None]:
+        """Fetch vectors with a single MGET.
+
+        Args:
+            keys: Cache keys.
+
+        Returns:
+            Cached vector or None for each key, in order.
+        """
+        if not keys:
+            return []
+        blobs = await self._redis.mget([self._prefix + key for key in keys])
+        return [
+            list(struct.unpack(f"<{len(blob) // 4}f", blob)) if blob else None for blob in blobs
+        ]
+
+    async def set_many(self, items: dict[bytes, Sequence[float]]) -> None:
+        """Store vectors in one pipelined round trip.
+
+        Args:
+            items: Mapping of cache key to vector.
+        """
+        if not items:
+            return
+        pipe = self._redis.pipeline(transaction=False)
+        for key, vector in items.items():
+            blob = struct.pack(f"<{len(vector)}f", *vector)
+            pipe.set(self._prefix + key, blob, ex=self._ttl)
+        await pipe.execute()
+
+    async def clear(self) -> None:
+        """Delete every entry under this cache's prefix."""
+        keys = [key async for key in self._redis.scan_iter(match=self._prefix + b"*")]
+        if keys:
+            await self._redis.delete(*keys)
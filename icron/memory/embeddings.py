@@ -6,13 +6,26 @@ Supports multiple embedding backends with automatic provider detection.
 from __future__ import annotations
 
 import asyncio
+import logging
 import os
+import weakref
 from abc import ABC, abstractmethod
+from functools import partial
 from operator import itemgetter
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Literal
 
 import httpx
 
+from icron.memory.cache import BaseEmbeddingCache, EmbeddingCache, embedding_cache_key
+from icron.utils.helpers import HTTP2_AVAILABLE
+
+
+# Optional orjson import for faster parsing of large embedding responses
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    from json import loads as _json_loads
+
 # Optional sentence-transformers import
 SENTENCE_TRANSFORMERS_AVAILABLE = False
 try:
@@ -25,9 +38,17 @@ except ImportError:
 if TYPE_CHECKING:
     from sentence_transformers import SentenceTransformer
 
+logger = logging.getLogger(__name__)
+
 
 class EmbeddingProvider(ABC):
-    """Abstract base class for embedding providers."""
+    """Abstract base class for embedding providers.
+
+    Providers that set ``_cache`` serve repeated texts from it and only send
+    cache misses to the backend.
+    """
+
+    _cache: BaseEmbeddingCache | None = None
 
     @abstractmethod
     async def embed(self, text: str) -> list[float]:
@@ -55,6 +76,110 @@ class EmbeddingProvider(ABC):
         """
         return [await self.embed(text) for text in texts]
 
+    @staticmethod
+    async def _embed_in_batches(
+        texts: list[str],
+        embed_chunk: Callable[[list[str]], Awaitable[list[list[float]]]],
+        *,
+        batch_size: int,
+        max_in_flight: int,
+    ) -> list[list[float]]:
+        """Split texts into batches and embed them concurrently.
+
+        Args:
+            texts: List of texts to embed.
+            embed_chunk: Coroutine embedding one batch, returning vectors in order.
+            batch_size: Maximum texts per request.
+            max_in_flight: Maximum concurrent requests.
+
+        Returns:
+            Embedding vectors in the order of texts.
+        """
+        batches = [texts[i:i + batch_size] for i in range(0, len(texts), batch_size)]
+        if len(batches) == 1:
+            return await embed_chunk(batches[0])
+
+        semaphore = asyncio.Semaphore(max_in_flight)
+
+        async def run(batch: list[str]) -> list[list[float]]:
+            async with semaphore:
+                return await embed_chunk(batch)
+
+        tasks = [asyncio.create_task(run(batch)) for batch in batches]
+        try:
+            # gather preserves argument order, so results line up with batches
+            results = await asyncio.gather(*tasks)
+        except BaseException:
+            # Don't leave the remaining requests running after a failure
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+        return [embedding for batch_result in results for embedding in batch_result]
+
+    @property
+    def _cache_namespace(self) -> str:
+        """Model identity that cached vectors are keyed under."""
+        return f"{type(self).__name__}:{getattr(self, 'MODEL', '')}:{self.dimension}"
+
+    async def _embed_cached(
+        self,
+        text: str,
+        embed_missing: Callable[[str], Awaitable[list[float]]],
+    ) -> list[float]:
+        """Embed one text, consulting the cache first.
+
+        Args:
+            text: The text to embed.
+            embed_missing: Coroutine embedding the text on a cache miss.
+
+        Returns:
+            Embedding vector.
+        """
+        if self._cache is None:
+            return await embed_missing(text)
+
+        key = embedding_cache_key(self._cache_namespace, text)
+        [cached] = await self._cache.get_many([key])
+        if cached is not None:
+            return cached
+        embedding = await embed_missing(text)
+        await self._cache.set_many({key: embedding})
+        return embedding
+
+    async def _embed_batch_cached(
+        self,
+        texts: list[str],
+        embed_missing: Callable[[list[str]], Awaitable[list[list[float]]]],
+    ) -> list[list[float]]:
+        """Embed texts, sending only cache misses (deduplicated) to the backend.
+
+        Args:
+            texts: List of texts to embed.
+            embed_missing: Coroutine embedding the missing texts, in order.
+
+        Returns:
+            Embedding vectors in the order of texts.
+        """
+        if self._cache is None or not texts:
+            return await embed_missing(texts)
+
+        namespace = self._cache_namespace
+        keys = [embedding_cache_key(namespace, text) for text in texts]
+        results = await self._cache.get_many(keys)
+
+        # Identical texts share a key, so each miss is embedded once
+        missing: dict[bytes, str] = {}
+        for key, text, cached in zip(keys, texts, results):
+            if cached is None:
+                missing.setdefault(key, text)
+        if not missing:
+            return results
+
+        fetched = dict(zip(missing, await embed_missing(list(missing.values()))))
+        await self._cache.set_many(fetched)
+        return [fetched[key] if cached is None else cached for key, cached in zip(keys, results)]
+
     @property
     @abstractmethod
     def dimension(self) -> int:
@@ -75,16 +200,24 @@ class OpenAIEmbedding(EmbeddingProvider):
     MAX_RETRIES = 3
     RETRY_DELAY = 1.0
 
-    def __init__(self, api_key: str, *, timeout: float = 30.0) -> None:
+    def __init__(
+        self,
+        api_key: str,
+        *,
+        timeout: float = 30.0,
+        cache: BaseEmbeddingCache | None = None,
+    ) -> None:
         """Initialize OpenAI embedding provider.
 
         Args:
             api_key: OpenAI API key.
             timeout: Request timeout in seconds.
+            cache: Embedding cache (default: in-process LRU).
         """
         self._api_key = api_key
         self._timeout = timeout
         self._client: httpx.AsyncClient | None = None
+        self._cache = cache if cache is not None else EmbeddingCache()
 
     async def _get_client(self) -> httpx.AsyncClient:
         """Get or create the HTTP client."""
@@ -117,7 +250,7 @@ class OpenAIEmbedding(EmbeddingProvider):
             try:
                 response = await client.post(self.API_URL, json=payload)
                 response.raise_for_status()
-                return response.json()
+                return _json_loads(response.content)
             except httpx.HTTPStatusError as e:
                 last_exception = e
                 if e.response.status_code == 429:  # Rate limited
@@ -143,15 +276,27 @@ class OpenAIEmbedding(EmbeddingProvider):
         Returns:
             Embedding vector as list of floats.
         """
+        return await self._embed_cached(text, self._embed_one)
+
+    async def _embed_one(self, text: str) -> list[float]:
+        """Embed a single text with one API call."""
         payload = {"input": text, "model": self.MODEL}
         result = await self._request_with_retry(payload)
         return result["data"][0]["embedding"]
 
-    async def embed_batch(self, texts: list[str]) -> list[list[float]]:
-        """Embed multiple texts in a single API call.
+    async def embed_batch(
+        self,
+        texts: list[str],
+        *,
+        max_in_flight: int = 8,
+        batch_size: int = 2048,
+    ) -> list[list[float]]:
+        """Embed multiple texts, sending large inputs as concurrent batch requests.
 
         Args:
             texts: List of texts to embed.
+            max_in_flight: Maximum concurrent API requests.
+            batch_size: Maximum texts per request (API limit is 2048).
 
         Returns:
             List of embedding vectors.
@@ -159,6 +304,23 @@ class OpenAIEmbedding(EmbeddingProvider):
         if not texts:
             return []
 
+        embed_missing = partial(
+            self._embed_in_batches,
+            embed_chunk=self._embed_chunk,
+            batch_size=batch_size,
+            max_in_flight=max_in_flight,
+        )
+        return await self._embed_batch_cached(texts, embed_missing)
+
+    async def _embed_chunk(self, texts: list[str]) -> list[list[float]]:
+        """Embed one batch in a single API call (with rate-limit retries).
+
+        Args:
+            texts: Texts for one request.
+
+        Returns:
+            Embedding vectors in input order.
+        """
         payload = {"input": texts, "model": self.MODEL}
         result = await self._request_with_retry(payload)
 
@@ -184,16 +346,24 @@ class GeminiEmbedding(EmbeddingProvider):
     DIMENSION = 768
     API_URL = "https://generativelanguage.googleapis.com/v1beta/models/{model}:embedContent"
 
-    def __init__(self, api_key: str, *, timeout: float = 30.0) -> None:
+    def __init__(
+        self,
+        api_key: str,
+        *,
+        timeout: float = 30.0,
+        cache: BaseEmbeddingCache | None = None,
+    ) -> None:
         """Initialize Gemini embedding provider.
 
         Args:
             api_key: Google API key.
             timeout: Request timeout in seconds.
+            cache: Embedding cache (default: in-process LRU).
         """
         self._api_key = api_key
         self._timeout = timeout
         self._client: httpx.AsyncClient | None = None
+        self._cache = cache if cache is not None else EmbeddingCache()
 
     async def _get_client(self) -> httpx.AsyncClient:
         """Get or create the HTTP client."""
@@ -213,6 +383,10 @@ class GeminiEmbedding(EmbeddingProvider):
         Returns:
             Embedding vector as list of floats.
         """
+        return await self._embed_cached(text, self._embed_one)
+
+    async def _embed_one(self, text: str) -> list[float]:
+        """Embed a single text with one embedContent call."""
         client = await self._get_client()
         url = self.API_URL.format(model=self.MODEL)
 
@@ -222,14 +396,22 @@ class GeminiEmbedding(EmbeddingProvider):
         )
         response.raise_for_status()
 
-        result = response.json()
+        result = _json_loads(response.content)
         return result["embedding"]["values"]
 
-    async def embed_batch(self, texts: list[str]) -> list[list[float]]:
-        """Embed multiple texts using Gemini batchEmbedContents API.
+    async def embed_batch(
+        self,
+        texts: list[str],
+        *,
+        max_in_flight: int = 8,
+        batch_size: int = 100,
+    ) -> list[list[float]]:
+        """Embed multiple texts using concurrent Gemini batchEmbedContents calls.
 
         Args:
             texts: List of texts to embed.
+            max_in_flight: Maximum concurrent API requests.
+            batch_size: Maximum texts per request (API limit is 100).
 
         Returns:
             List of embedding vectors.
@@ -237,6 +419,23 @@ class GeminiEmbedding(EmbeddingProvider):
         if not texts:
             return []
 
+        embed_missing = partial(
+            self._embed_in_batches,
+            embed_chunk=self._embed_chunk,
+            batch_size=batch_size,
+            max_in_flight=max_in_flight,
+        )
+        return await self._embed_batch_cached(texts, embed_missing)
+
+    async def _embed_chunk(self, texts: list[str]) -> list[list[float]]:
+        """Embed one batch with a single batchEmbedContents call.
+
+        Args:
+            texts: Texts for one request.
+
+        Returns:
+            Embedding vectors in input order.
+        """
         client = await self._get_client()
         url = f"https://generativelanguage.googleapis.com/v1beta/models/{self.MODEL}:batchEmbedContents"
 
@@ -248,7 +447,7 @@ class GeminiEmbedding(EmbeddingProvider):
         )
         response.raise_for_status()
 
-        result = response.json()
+        result = _json_loads(response.content)
         return [emb["values"] for emb in result["embeddings"]]
 
     @property
@@ -269,6 +468,12 @@ class OllamaEmbedding(EmbeddingProvider):
     DIMENSION = 768  # nomic-embed-text dimension
     DEFAULT_HOST = "http://localhost:11434"
 
+    # Keep-alive pools shared by every instance and is_available(), one per event
+    # loop; an entry goes away with its loop
+    _SHARED_CLIENTS: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient] = (
+        weakref.WeakKeyDictionary()
+    )
+
     def __init__(
         self,
         model: str | None = None,
@@ -286,17 +491,41 @@ class OllamaEmbedding(EmbeddingProvider):
         self._model = model or self.MODEL
         self._host = (host or os.getenv("OLLAMA_HOST") or self.DEFAULT_HOST).rstrip("/")
         self._timeout = timeout
-        self._client: httpx.AsyncClient | None = None
         self._dimension: int | None = None
 
-    async def _get_client(self) -> httpx.AsyncClient:
-        """Get or create the HTTP client."""
-        if self._client is None or self._client.is_closed:
-            self._client = httpx.AsyncClient(
-                timeout=httpx.Timeout(self._timeout),
+    @classmethod
+    def _shared_client(cls) -> httpx.AsyncClient:
+        """Get or create the pooled HTTP client for the running event loop.
+
+        Returns:
+            Shared httpx client with keep-alive connections.
+        """
+        loop = asyncio.get_running_loop()
+        client = OllamaEmbedding._SHARED_CLIENTS.get(loop)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(
+                http2=HTTP2_AVAILABLE,
+                limits=httpx.Limits(
+                    max_keepalive_connections=32,
+                    max_connections=64,
+                    keepalive_expiry=60,
+                ),
+                timeout=httpx.Timeout(30.0),
                 headers={"Content-Type": "application/json"},
             )
-        return self._client
+            OllamaEmbedding._SHARED_CLIENTS[loop] = client
+        return client
+
+    @classmethod
+    async def aclose(cls) -> None:
+        """Close the running loop's shared HTTP client (call before the loop ends).
+
+        A client can only be closed from its own loop, so each asyncio.run()
+        that used Ollama should call this (or close()) before returning.
+        """
+        client = OllamaEmbedding._SHARED_CLIENTS.pop(asyncio.get_running_loop(), None)
+        if client is not None and not client.is_closed:
+            await client.aclose()
 
     async def embed(self, text: str) -> list[float]:
         """Embed a single text using Ollama API.
@@ -307,11 +536,11 @@ class OllamaEmbedding(EmbeddingProvider):
         Returns:
             Embedding vector as list of floats.
         """
-        client = await self._get_client()
+        client = self._shared_client()
         url = f"{self._host}/api/embeddings"
 
         payload = {"model": self._model, "prompt": text}
-        response = await client.post(url, json=payload)
+        response = await client.post(url, json=payload, timeout=self._timeout)
         response.raise_for_status()
 
         result = response.json()
@@ -345,9 +574,11 @@ class OllamaEmbedding(EmbeddingProvider):
         return self._dimension or self.DIMENSION
 
     async def close(self) -> None:
-        """Close the HTTP client."""
-        if self._client and not self._client.is_closed:
-            await self._client.aclose()
+        """Release the running loop's shared HTTP pool.
+
+        Other instances on the same loop open a fresh pool on their next request.
+        """
+        await self.aclose()
 
     @staticmethod
     async def is_available(host: str | None = None) -> bool:
@@ -361,9 +592,9 @@ class OllamaEmbedding(EmbeddingProvider):
         """
         host = (host or os.getenv("OLLAMA_HOST") or OllamaEmbedding.DEFAULT_HOST).rstrip("/")
         try:
-            async with httpx.AsyncClient(timeout=httpx.Timeout(5.0)) as client:
-                response = await client.get(f"{host}/api/tags")
-                return response.status_code == 200
+            client = OllamaEmbedding._shared_client()
+            response = await client.get(f"{host}/api/tags", timeout=5.0)
+            return response.status_code == 200
         except (httpx.RequestError, httpx.TimeoutException):
             return False
 
@@ -372,16 +603,36 @@ class LocalEmbedding(EmbeddingProvider):
     """Local embedding provider using sentence-transformers.
 
     Requires sentence-transformers package: pip install sentence-transformers
+    The opt-in ONNX backend additionally needs: pip install "sentence-transformers[onnx]"
+    and falls back to PyTorch when it is unavailable. Vectors differ slightly
+    between backends, so re-index after switching.
     """
 
     MODEL = "all-MiniLM-L6-v2"
     DIMENSION = 384
+    # Float32 ONNX export shipped with the sentence-transformers hub models; pass
+    # onnx_file to pick a quantized one (e.g. onnx/model_qint8_avx512_vnni.onnx)
+    ONNX_FILE = "onnx/model.onnx"
+    BATCH_SIZE = 64
+    # Loaded models shared by all instances, keyed by (model, backend, onnx_file)
+    _MODEL_CACHE: dict[tuple[str, str, str], SentenceTransformer] = {}
 
-    def __init__(self, model: str | None = None) -> None:
+    def __init__(
+        self,
+        model: str | None = None,
+        *,
+        backend: Literal["torch", "onnx", "openvino"] = "torch",
+        onnx_file: str | None = None,
+        cache: BaseEmbeddingCache | None = None,
+    ) -> None:
         """Initialize local embedding provider.
 
         Args:
             model: Model name (default: all-MiniLM-L6-v2).
+            backend: Inference backend. "torch" (default) uses the PyTorch model;
+                "onnx" runs an ONNX export through ONNX Runtime.
+            onnx_file: ONNX file inside the model repo (default: float32 export).
+            cache: Embedding cache (default: in-process LRU).
 
         Raises:
             ImportError: If sentence-transformers is not installed.
@@ -393,12 +644,66 @@ class LocalEmbedding(EmbeddingProvider):
             )
 
         self._model_name = model or self.MODEL
+        self._backend = backend
+        self._onnx_file = onnx_file or self.ONNX_FILE
         self._model: SentenceTransformer | None = None
+        self._cache = cache if cache is not None else EmbeddingCache()
+
+    @property
+    def _cache_namespace(self) -> str:
+        """Model identity that cached vectors are keyed under.
+
+        Includes the backend (and ONNX file), whose vectors differ slightly for
+        the same model.
+        """
+        backend = f"onnx={self._onnx_file}" if self._backend == "onnx" else self._backend
+        return f"{type(self).__name__}:{self._model_name}:{backend}:{self.dimension}"
+
+    def _backend_kwargs(self) -> dict[str, Any]:
+        """Build SentenceTransformer kwargs for the configured backend."""
+        if self._backend == "torch":
+            return {}
+        if self._backend == "openvino":
+            return {"backend": "openvino"}
+
+        model_kwargs: dict[str, Any] = {
+            "file_name": self._onnx_file,
+            "provider": "CPUExecutionProvider",
+        }
+        try:
+            import onnxruntime as ort
+
+            options = ort.SessionOptions()
+            options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+            model_kwargs["session_options"] = options
+        except ImportError:
+            pass
+        return {"backend": "onnx", "model_kwargs": model_kwargs}
 
     def _get_model(self) -> SentenceTransformer:
-        """Lazy load the model."""
+        """Lazy load the model, falling back to PyTorch if the backend fails.
+
+        Loaded models are cached on the class, so further instances for the
+        same model and backend reuse it instead of loading it again.
+        """
         if self._model is None:
-            self._model = SentenceTransformer(self._model_name)
+            cache_key = (self._model_name, self._backend, self._onnx_file)
+            self._model = self._MODEL_CACHE.get(cache_key)
+        if self._model is None:
+            kwargs = self._backend_kwargs()
+            try:
+                self._model = SentenceTransformer(self._model_name, **kwargs)
+            except (ImportError, TypeError, ValueError, OSError) as e:
+                if not kwargs:
+                    raise
+                logger.warning(
+                    "%s backend unavailable for %s, using PyTorch: %s",
+                    self._backend,
+                    self._model_name,
+                    e,
+                )
+                self._model = SentenceTransformer(self._model_name)
+            self._MODEL_CACHE[cache_key] = self._model
         return self._model
 
     async def embed(self, text: str) -> list[float]:
@@ -410,15 +715,14 @@ class LocalEmbedding(EmbeddingProvider):
         Returns:
             Embedding vector as list of floats.
         """
-        model = self._get_model()
-        # Run CPU-bound encoding in executor to avoid blocking
-        loop = asyncio.get_running_loop()
-        embedding = await loop.run_in_executor(None, model.encode, text)
-        return embedding.tolist()
+        return (await self.embed_batch([text]))[0]
 
     async def embed_batch(self, texts: list[str]) -> list[list[float]]:
         """Embed multiple texts efficiently with sentence-transformers.
 
+        Texts are encoded in length order so each internal batch pads to
+        similar lengths, then returned in the caller's order.
+
         Args:
             texts: List of texts to embed.
 
@@ -428,10 +732,28 @@ class LocalEmbedding(EmbeddingProvider):
         if not texts:
             return []
 
+        return await self._embed_batch_cached(texts, self._encode)
+
+    async def _encode(self, texts: list[str]) -> list[list[float]]:
+        """Encode texts with the model in a worker thread."""
         model = self._get_model()
+        order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+        encode = partial(
+            model.encode,
+            [texts[i] for i in order],
+            batch_size=self.BATCH_SIZE,
+            convert_to_numpy=True,
+            normalize_embeddings=True,
+            show_progress_bar=False,
+        )
+        # Run CPU-bound encoding in executor to avoid blocking
         loop = asyncio.get_running_loop()
-        embeddings = await loop.run_in_executor(None, model.encode, texts)
-        return [emb.tolist() for emb in embeddings]
+        embeddings = await loop.run_in_executor(None, encode)
+
+        result: list[list[float]] = [[] for _ in texts]
+        for position, index in enumerate(order):
+            result[index] = embeddings[position].tolist()
+        return result
 
     @property
     def dimension(self) -> int:
@@ -462,6 +784,7 @@ async def get_embedding_provider(config: dict[str, Any] | None = None) -> Embedd
             - ollama_host: Ollama server URL
             - ollama_model: Ollama model name
             - local_model: Sentence-transformers model name
+            - local_backend: Sentence-transformers backend ("torch", "onnx", "openvino")
 
     Returns:
         Configured EmbeddingProvider instance.
@@ -498,7 +821,10 @@ async def get_embedding_provider(config: dict[str, Any] | None = None) -> Embedd
         )
 
     if provider == "local":
-        return LocalEmbedding(model=config.get("local_model"))
+        return LocalEmbedding(
+            model=config.get("local_model"),
+            backend=config.get("local_backend", "torch"),
+        )
 
     # Auto-detection
     if provider == "auto":
@@ -519,7 +845,10 @@ async def get_embedding_provider(config: dict[str, Any] | None = None) -> Embedd
 
         # Fall back to local
         if SENTENCE_TRANSFORMERS_AVAILABLE:
-            return LocalEmbedding(model=config.get("local_model"))
+            return LocalEmbedding(
+                model=config.get("local_model"),
+                backend=config.get("local_backend", "torch"),
+            )
 
         raise ValueError(
             "No embedding provider available. Please provide an API key "
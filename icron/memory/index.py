@@ -1,24 +1,45 @@
 """Vector index module using sqlite-vec for semantic search.
 
 Provides vector storage and hybrid search (vector + BM25) with automatic
-fallback to pure Python cosine similarity if sqlite-vec is unavailable.
+fallback to NumPy (or pure Python) cosine similarity if sqlite-vec is
+unavailable.
 """
 
 from __future__ import annotations
 
 import logging
 import math
+import os
 import sqlite3
 import struct
 from contextlib import contextmanager
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Generator
+from typing import Generator, Sequence
+
+# Optional NumPy import for vectorized similarity
+NUMPY_AVAILABLE = False
+try:
+    import numpy as np
+
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None  # type: ignore[assignment]
 
 logger = logging.getLogger(__name__)
 
+# Sidecar matrix files start with a random generation token that must match
+# the one recorded in SQLite, so a torn rebuild is detected and redone
+_VEC_HEADER_SIZE = 16
+
+# Fraction of dead (deleted) rows in the sidecar that triggers a compaction
+_VEC_COMPACT_RATIO = 0.5
+
+# PRAGMA user_version of the current storage format; 1 = unit-length embeddings
+_SCHEMA_VERSION = 1
+
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class SearchResult:
     """Result from a vector or hybrid search query."""
 
@@ -37,45 +58,90 @@ class VectorIndex:
     search combining vector similarity with BM25 full-text search.
 
     Attributes:
-        db_path: Path to the SQLite database file.
+        db_path: Path to the SQLite database file (None for an injected connection).
         dimension: Dimensionality of embedding vectors.
+        quantize: Whether new embeddings are stored as int8 with a per-vector scale.
         has_sqlite_vec: Whether sqlite-vec extension is available.
+
+    For file-backed indexes searched with NumPy, embeddings are mirrored into a
+    ``.vec`` file next to the database and memory-mapped on first search, so a
+    new process does not re-read every BLOB from SQLite. SQLite stays the source
+    of truth: the file is rebuilt from it whenever the two disagree.
     """
 
-    def __init__(self, db_path: Path, dimension: int = 1536) -> None:
+    def __init__(
+        self,
+        db_path: Path | None = None,
+        dimension: int = 1536,
+        *,
+        connection: sqlite3.Connection | None = None,
+        quantize: bool = False,
+    ) -> None:
         """Initialize the vector index.
 
         Args:
             db_path: Path to the SQLite database file.
             dimension: Dimensionality of embedding vectors (default: 1536 for OpenAI).
+            connection: Existing SQLite connection to use instead of db_path, e.g.
+                ``sqlite3.connect(":memory:")``. It is kept open and reused for
+                every operation; the caller owns closing it.
+            quantize: Store new embeddings as int8 plus a float32 scale, quartering
+                storage at a cosine error of roughly 1e-3. Existing float32 rows
+                remain readable either way.
+
+        Raises:
+            ValueError: If neither or both of db_path and connection are given.
         """
-        self.db_path = Path(db_path)
+        if (db_path is None) == (connection is None):
+            raise ValueError("Provide exactly one of db_path or connection")
+
+        self.db_path = Path(db_path) if db_path is not None else None
+        self._conn = connection
         self.dimension = dimension
+        self.quantize = quantize
         self.has_sqlite_vec = False
 
-        # Ensure parent directory exists
-        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        # In-memory copy of stored vectors for NumPy search, built lazily on
+        # first search and reloaded whenever the index_state version moves
+        self._matrix: np.ndarray | None = None
+        self._matrix_version = -1
+        self._ids: np.ndarray | None = None
+        self._scales: np.ndarray | None = None  # Per-row scale when quantized
+        self._live: np.ndarray | None = None  # Sidecar rows backing self._ids
+
+        if self.db_path is not None:
+            # Ensure parent directory exists
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
 
         # Initialize database and check for sqlite-vec
         self._init_db()
 
+        # Memory-mapped matrix file, only used by the NumPy search path
+        self._vec_path: Path | None = None
+        if self.db_path is not None and NUMPY_AVAILABLE and not self.has_sqlite_vec:
+            self._vec_path = self.db_path.with_suffix(".vec")
+
     @contextmanager
     def _connection(self) -> Generator[sqlite3.Connection, None, None]:
         """Context manager for database connections.
 
+        Opens a fresh connection per call, or reuses the injected one.
+
         Yields:
             SQLite connection with row factory enabled.
         """
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
+        conn = self._conn
+        if conn is None:
+            conn = sqlite3.connect(self.db_path)
+            self._configure_connection(conn)
 
-        # Try to load sqlite-vec extension if we know it's available
-        if self.has_sqlite_vec:
-            try:
-                conn.enable_load_extension(True)
-                conn.load_extension("vec0")
-            except (sqlite3.OperationalError, AttributeError):
-                pass
+            # Try to load sqlite-vec extension if we know it's available
+            if self.has_sqlite_vec:
+                try:
+                    conn.enable_load_extension(True)
+                    conn.load_extension("vec0")
+                except (sqlite3.OperationalError, AttributeError):
+                    pass
 
         try:
             yield conn
@@ -84,7 +150,20 @@ class VectorIndex:
             conn.rollback()
             raise
         finally:
-            conn.close()
+            if self._conn is None:
+                conn.close()
+
+    @staticmethod
+    def _configure_connection(conn: sqlite3.Connection) -> None:
+        """Apply per-connection settings.
+
+        Args:
+            conn: SQLite connection to configure.
+        """
+        conn.row_factory = sqlite3.Row
+        # WAL (set in _init_db) only needs fsync at checkpoints with NORMAL
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
 
     def _try_load_sqlite_vec(self, conn: sqlite3.Connection) -> bool:
         """Attempt to load the sqlite-vec extension.
@@ -108,10 +187,19 @@ class VectorIndex:
 
     def _init_db(self) -> None:
         """Initialize the database schema."""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
+        if self._conn is not None:
+            conn = self._conn
+            self._configure_connection(conn)
+        else:
+            conn = sqlite3.connect(self.db_path)
+            conn.row_factory = sqlite3.Row
 
         try:
+            # Larger pages suit the BLOB-heavy rows; only applies to new databases
+            conn.execute("PRAGMA page_size=8192")
+            # Persistent setting: writers append to the WAL instead of rewriting pages
+            conn.execute("PRAGMA journal_mode=WAL")
+
             # Check for sqlite-vec availability
             self.has_sqlite_vec = self._try_load_sqlite_vec(conn)
 
@@ -124,10 +212,16 @@ class VectorIndex:
                     end_line INTEGER,
                     text TEXT NOT NULL,
                     embedding BLOB,
+                    norm REAL,
                     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
                 )
             """)
 
+            # Databases created before the norm column existed get it added here
+            columns = {row["name"] for row in conn.execute("PRAGMA table_info(chunks)")}
+            if "norm" not in columns:
+                conn.execute("ALTER TABLE chunks ADD COLUMN norm REAL")
+
             # Create index on file_path for fast lookups
             conn.execute("""
                 CREATE INDEX IF NOT EXISTS idx_chunks_file_path 
@@ -151,6 +245,47 @@ class VectorIndex:
                     logger.warning("Failed to create vec_chunks table: %s", e)
                     self.has_sqlite_vec = False
 
+            # Row of each chunk's vector in the .vec sidecar file (row is NULL
+            # for chunks without an embedding), plus the file's generation token
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS vec_offsets (
+                    id INTEGER PRIMARY KEY,
+                    row INTEGER
+                )
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS vec_sidecar (
+                    generation BLOB NOT NULL,
+                    row_size INTEGER NOT NULL
+                )
+            """)
+            conn.execute("""
+                CREATE TRIGGER IF NOT EXISTS chunks_offsets_ad AFTER DELETE ON chunks BEGIN
+                    DELETE FROM vec_offsets WHERE id = old.id;
+                END
+            """)
+
+            # Change counter bumped on every chunk write, by any connection or
+            # process, so a cached matrix can tell when it is stale
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS index_state (
+                    id INTEGER PRIMARY KEY CHECK (id = 0),
+                    version INTEGER NOT NULL
+                )
+            """)
+            conn.execute("INSERT OR IGNORE INTO index_state (id, version) VALUES (0, 0)")
+            version_triggers = {
+                "chunks_version_ai": "INSERT",
+                "chunks_version_ad": "DELETE",
+                "chunks_version_au": "UPDATE OF embedding",
+            }
+            for name, event in version_triggers.items():
+                conn.execute(f"""
+                    CREATE TRIGGER IF NOT EXISTS {name} AFTER {event} ON chunks BEGIN
+                        UPDATE index_state SET version = version + 1 WHERE id = 0;
+                    END
+                """)
+
             # Create FTS5 virtual table for BM25 search
             conn.execute("""
                 CREATE VIRTUAL TABLE IF NOT EXISTS fts_chunks USING fts5(
@@ -180,39 +315,96 @@ class VectorIndex:
                 END
             """)
 
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            if version < _SCHEMA_VERSION:
+                self._normalize_stored(conn)
+                conn.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+
             conn.commit()
             mode = "sqlite-vec" if self.has_sqlite_vec else "Python fallback"
             logger.info("Vector index initialized with %s mode", mode)
 
         finally:
-            conn.close()
+            if self._conn is None:
+                conn.close()
+
+    def _serialize_embedding(self, embedding: Sequence[float]) -> bytes:
+        """Serialize embedding to its storage format.
 
-    def _serialize_embedding(self, embedding: list[float]) -> bytes:
-        """Serialize embedding to binary format.
+        Float32 embeddings are stored as raw little-endian floats (4 * dim bytes).
+        Quantized embeddings are stored as a float32 scale followed by int8
+        values (4 + dim bytes), so the two formats are told apart by length.
 
         Args:
-            embedding: List of float values.
+            embedding: Sequence of float values (list or ndarray).
 
         Returns:
             Binary representation of the embedding.
         """
-        return struct.pack(f"{len(embedding)}f", *embedding)
+        if self.quantize:
+            return self._pack_int8(embedding)
+        return self._pack_float32(embedding)
 
-    def _deserialize_embedding(self, data: bytes) -> list[float]:
-        """Deserialize embedding from binary format.
+    def _deserialize_embedding(self, data: bytes) -> Sequence[float]:
+        """Deserialize embedding from either storage format.
 
         Args:
             data: Binary embedding data.
 
         Returns:
-            List of float values.
+            Float32 ndarray when NumPy is available, otherwise a list of floats.
         """
+        if len(data) != 4 * self.dimension and len(data) == 4 + self.dimension:
+            (scale,) = struct.unpack_from("<f", data)
+            if NUMPY_AVAILABLE:
+                return np.frombuffer(data, dtype=np.int8, offset=4).astype(np.float32) * scale
+            return [v * scale for v in struct.unpack_from(f"<{len(data) - 4}b", data, 4)]
+        if NUMPY_AVAILABLE:
+            return np.frombuffer(data, dtype="<f4")
         count = len(data) // 4  # 4 bytes per float
-        return list(struct.unpack(f"{count}f", data))
+        return list(struct.unpack(f"<{count}f", data))
+
+    @staticmethod
+    def _pack_float32(embedding: Sequence[float]) -> bytes:
+        """Pack an embedding as raw little-endian float32 bytes.
+
+        Args:
+            embedding: Sequence of float values.
+
+        Returns:
+            4 * len(embedding) bytes.
+        """
+        if NUMPY_AVAILABLE:
+            return np.ascontiguousarray(embedding, dtype="<f4").tobytes()
+        return struct.pack(f"<{len(embedding)}f", *embedding)
+
+    @staticmethod
+    def _pack_int8(embedding: Sequence[float]) -> bytes:
+        """Quantize an embedding to int8 with a per-vector scale.
+
+        Each value is stored as round(x * 127 / max|x|); the scale max|x| / 127
+        is stored in front as float32.
+
+        Args:
+            embedding: Sequence of float values.
+
+        Returns:
+            4 + len(embedding) bytes.
+        """
+        if NUMPY_AVAILABLE:
+            arr = np.asarray(embedding, dtype=np.float32)
+            peak = float(np.abs(arr).max()) if arr.size else 0.0
+            scale = peak / 127 if peak else 1.0
+            values = np.clip(np.rint(arr / scale), -127, 127).astype(np.int8)
+            return struct.pack("<f", scale) + values.tobytes()
+        peak = max((abs(x) for x in embedding), default=0.0)
+        scale = peak / 127 if peak else 1.0
+        values = [max(-127, min(127, round(x / scale))) for x in embedding]
+        return struct.pack(f"<f{len(values)}b", scale, *values)
 
     @staticmethod
     def _cosine_similarity(
-        vec_a: list[float], vec_b: list[float]
+        vec_a: Sequence[float], vec_b: Sequence[float]
     ) -> float:
         """Compute cosine similarity between two vectors.
 
@@ -228,6 +420,15 @@ class VectorIndex:
                 f"Vector dimensions don't match: {len(vec_a)} vs {len(vec_b)}"
             )
 
+        if NUMPY_AVAILABLE:
+            a = np.asarray(vec_a, dtype=np.float32)
+            b = np.asarray(vec_b, dtype=np.float32)
+            norm_a = float(np.linalg.norm(a))
+            norm_b = float(np.linalg.norm(b))
+            if norm_a == 0 or norm_b == 0:
+                return 0.0
+            return float(a @ b) / (norm_a * norm_b)
+
         dot_product = sum(a * b for a, b in zip(vec_a, vec_b))
         norm_a = math.sqrt(sum(a * a for a in vec_a))
         norm_b = math.sqrt(sum(b * b for b in vec_b))
@@ -237,6 +438,65 @@ class VectorIndex:
 
         return dot_product / (norm_a * norm_b)
 
+    @staticmethod
+    def _vector_norm(embedding: Sequence[float]) -> float:
+        """Compute the L2 norm of an embedding.
+
+        Args:
+            embedding: Embedding vector.
+
+        Returns:
+            L2 norm of the vector.
+        """
+        if NUMPY_AVAILABLE:
+            return float(np.linalg.norm(np.asarray(embedding, dtype=np.float32)))
+        return math.sqrt(sum(x * x for x in embedding))
+
+    @classmethod
+    def _normalize(cls, embedding: Sequence[float]) -> tuple[Sequence[float], float]:
+        """Scale an embedding to unit length.
+
+        Stored and query vectors are unit length, so cosine similarity is a
+        plain dot product. Zero vectors are returned unchanged.
+
+        Args:
+            embedding: Embedding vector.
+
+        Returns:
+            Tuple of (unit vector, original L2 norm).
+        """
+        norm = cls._vector_norm(embedding)
+        if not norm:
+            return embedding, 0.0
+        if NUMPY_AVAILABLE:
+            return np.asarray(embedding, dtype=np.float32) / np.float32(norm), norm
+        return [x / norm for x in embedding], norm
+
+    def _normalize_stored(self, conn: sqlite3.Connection) -> None:
+        """Rewrite embeddings stored before vectors were kept at unit length.
+
+        Each row keeps its storage format (float32 or int8); its original
+        magnitude goes to the norm column.
+
+        Args:
+            conn: Active database connection.
+        """
+        quant_size = 4 + self.dimension
+        updates = []
+        for row in conn.execute(
+            "SELECT id, embedding FROM chunks WHERE embedding IS NOT NULL"
+        ):
+            blob = row["embedding"]
+            unit, norm = self._normalize(self._deserialize_embedding(blob))
+            pack = self._pack_int8 if len(blob) == quant_size else self._pack_float32
+            updates.append((pack(unit), norm, row["id"]))
+
+        if updates:
+            conn.executemany("UPDATE chunks SET embedding = ?, norm = ? WHERE id = ?", updates)
+            logger.info("Normalized %d stored embeddings to unit length", len(updates))
+        # Any .vec sidecar still holds the old vectors
+        conn.execute("DELETE FROM vec_sidecar")
+
     def add_chunk(
         self,
         file_path: str,
@@ -266,30 +526,120 @@ class VectorIndex:
                 f"index dimension {self.dimension}"
             )
 
-        embedding_blob = self._serialize_embedding(embedding)
+        # Stored unit length; norm keeps the original magnitude
+        unit, norm = self._normalize(embedding)
+        embedding_blob = self._serialize_embedding(unit)
+        # sqlite-vec's FLOAT[] column always takes float32, even when storage is quantized
+        vec_blob = self._pack_float32(unit) if self.quantize else embedding_blob
 
         with self._connection() as conn:
             cursor = conn.execute(
                 """
-                INSERT INTO chunks (file_path, start_line, end_line, text, embedding)
-                VALUES (?, ?, ?, ?, ?)
+                INSERT INTO chunks (file_path, start_line, end_line, text, embedding, norm)
+                VALUES (?, ?, ?, ?, ?, ?)
                 """,
-                (file_path, start_line, end_line, text, embedding_blob),
+                (file_path, start_line, end_line, text, embedding_blob, norm),
             )
             chunk_id = cursor.lastrowid
+            self._invalidate_matrix()
+            if chunk_id is not None:
+                self._append_vectors(conn, [chunk_id], [embedding_blob])
 
             # Add to vector index if available
             if self.has_sqlite_vec and chunk_id is not None:
                 try:
                     conn.execute(
                         "INSERT INTO vec_chunks (id, embedding) VALUES (?, ?)",
-                        (chunk_id, embedding_blob),
+                        (chunk_id, vec_blob),
                     )
                 except sqlite3.OperationalError as e:
                     logger.warning("Failed to insert into vec_chunks: %s", e)
 
             return chunk_id or 0
 
+    def add_chunks(self, chunks: Sequence[dict]) -> int:
+        """Add many chunks in a single transaction.
+
+        Embeddings are validated and serialized up front, then inserted with one
+        executemany() and a single commit instead of one transaction per chunk.
+
+        Args:
+            chunks: Chunk dicts with keys text, embedding, file_path (or file, as
+                produced by MemoryStore.chunk_text), and optional start_line and
+                end_line.
+
+        Returns:
+            Number of chunks inserted.
+
+        Raises:
+            ValueError: If any embedding dimension doesn't match index dimension.
+        """
+        if not chunks:
+            return 0
+
+        embeddings = [chunk["embedding"] for chunk in chunks]
+        for embedding in embeddings:
+            if len(embedding) != self.dimension:
+                raise ValueError(
+                    f"Embedding dimension {len(embedding)} doesn't match "
+                    f"index dimension {self.dimension}"
+                )
+
+        if NUMPY_AVAILABLE:
+            matrix = np.asarray(embeddings, dtype=np.float32)
+            row_norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+            unit = np.divide(matrix, row_norms, out=np.zeros_like(matrix), where=row_norms != 0)
+            norms = row_norms[:, 0].tolist()
+            embeddings = list(unit)
+        else:
+            embeddings, norms = map(list, zip(*(self._normalize(e) for e in embeddings)))
+
+        params = [
+            (
+                chunk.get("file_path", chunk.get("file")),
+                chunk.get("start_line"),
+                chunk.get("end_line"),
+                chunk["text"],
+                self._serialize_embedding(embedding),
+                norm,
+            )
+            for chunk, embedding, norm in zip(chunks, embeddings, norms)
+        ]
+        blobs = [row[4] for row in params]
+        insert_sql = """
+            INSERT INTO chunks (file_path, start_line, end_line, text, embedding, norm)
+            VALUES (?, ?, ?, ?, ?, ?)
+        """
+
+        with self._connection() as conn:
+            if not self.has_sqlite_vec:
+                conn.executemany(insert_sql, params)
+            else:
+                # vec_chunks rows need each chunk ID, so insert one at a time
+                # (still a single transaction)
+                for row, embedding in zip(params, embeddings):
+                    chunk_id = conn.execute(insert_sql, row).lastrowid
+                    try:
+                        conn.execute(
+                            "INSERT INTO vec_chunks (id, embedding) VALUES (?, ?)",
+                            (chunk_id, self._pack_float32(embedding)),
+                        )
+                    except sqlite3.OperationalError as e:
+                        logger.warning("Failed to insert into vec_chunks: %s", e)
+            self._invalidate_matrix()
+
+            if self._vec_path is not None:
+                # New rows take the highest IDs while this transaction holds the write lock
+                ids = [
+                    row["id"]
+                    for row in conn.execute(
+                        "SELECT id FROM chunks ORDER BY id DESC LIMIT ?", (len(params),)
+                    )
+                ]
+                self._append_vectors(conn, ids[::-1], blobs)
+
+        return len(params)
+
     def search(
         self, query_embedding: list[float], limit: int = 10
     ) -> list[SearchResult]:
@@ -314,6 +664,71 @@ class VectorIndex:
             else:
                 return self._search_python_fallback(conn, query_embedding, limit)
 
+    def search_arrays(
+        self, query_embedding: Sequence[float], limit: int = 10
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Search for similar chunks, returning chunk IDs and scores as arrays.
+
+        Unlike search(), no chunk text is read; pass the slice of IDs actually
+        needed to fetch_results().
+
+        Args:
+            query_embedding: Query vector to search for.
+            limit: Maximum number of results to return.
+
+        Returns:
+            Tuple of (int64 chunk IDs, float32 scores), best first.
+
+        Raises:
+            ImportError: If NumPy is not installed.
+            ValueError: If the query dimension doesn't match the index dimension.
+        """
+        if not NUMPY_AVAILABLE:
+            raise ImportError("numpy is required for search_arrays. Install with: pip install numpy")
+        if len(query_embedding) != self.dimension:
+            raise ValueError(
+                f"Query embedding dimension {len(query_embedding)} doesn't "
+                f"match index dimension {self.dimension}"
+            )
+
+        with self._connection() as conn:
+            if self.has_sqlite_vec:
+                rows = conn.execute(
+                    """
+                    SELECT id, vec_distance_cosine(embedding, ?) AS distance
+                    FROM vec_chunks
+                    ORDER BY distance ASC
+                    LIMIT ?
+                    """,
+                    (self._pack_float32(query_embedding), limit),
+                ).fetchall()
+                ids = np.array([row["id"] for row in rows], dtype=np.int64)
+                distances = np.array([row["distance"] or 0.0 for row in rows], dtype=np.float32)
+                return ids, 1.0 - distances
+
+            self._ensure_matrix(conn)
+            if self._ids is None or not len(self._ids) or limit <= 0:
+                return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+
+            scores = self._matrix_scores(query_embedding)
+            top = self._top_k(scores, limit)
+            return self._ids[top], scores[top]
+
+    def fetch_results(
+        self, ids: Sequence[int], scores: Sequence[float]
+    ) -> list[SearchResult]:
+        """Build SearchResult objects for chunk IDs from search_arrays().
+
+        Args:
+            ids: Chunk IDs in result order.
+            scores: Score for each ID.
+
+        Returns:
+            SearchResult objects in the order of ids (deleted chunks are skipped).
+        """
+        with self._connection() as conn:
+            return self._fetch_results(conn, [int(i) for i in ids], [float(x) for x in scores])
+
     def _search_sqlite_vec(
         self,
         conn: sqlite3.Connection,
@@ -330,7 +745,7 @@ class VectorIndex:
         Returns:
             List of SearchResult objects.
         """
-        query_blob = self._serialize_embedding(query_embedding)
+        query_blob = self._pack_float32(query_embedding)
 
         try:
             rows = conn.execute(
@@ -366,7 +781,11 @@ class VectorIndex:
         query_embedding: list[float],
         limit: int,
     ) -> list[SearchResult]:
-        """Search using pure Python cosine similarity.
+        """Search using in-process cosine similarity.
+
+        With NumPy available, scores come from one matrix-vector product over the
+        cached embedding matrix, and only the top rows are fetched from SQLite.
+        Otherwise each row is scored in pure Python.
 
         Args:
             conn: Active database connection.
@@ -376,6 +795,9 @@ class VectorIndex:
         Returns:
             List of SearchResult objects.
         """
+        if NUMPY_AVAILABLE:
+            return self._search_numpy(conn, query_embedding, limit)
+
         rows = conn.execute(
             """
             SELECT id, file_path, text, start_line, end_line, embedding
@@ -385,10 +807,12 @@ class VectorIndex:
         ).fetchall()
 
         results: list[tuple[float, SearchResult]] = []
+        query, _ = self._normalize(query_embedding)
 
         for row in rows:
             embedding = self._deserialize_embedding(row["embedding"])
-            score = self._cosine_similarity(query_embedding, embedding)
+            # Both vectors are unit length, so the dot product is the cosine
+            score = sum(a * b for a, b in zip(query, embedding))
 
             results.append(
                 (
@@ -407,6 +831,384 @@ class VectorIndex:
         results.sort(key=lambda x: x[0], reverse=True)
         return [r[1] for r in results[:limit]]
 
+    def _search_numpy(
+        self,
+        conn: sqlite3.Connection,
+        query_embedding: Sequence[float],
+        limit: int,
+    ) -> list[SearchResult]:
+        """Search the cached embedding matrix with NumPy.
+
+        Args:
+            conn: Active database connection.
+            query_embedding: Query vector.
+            limit: Maximum results.
+
+        Returns:
+            List of SearchResult objects ordered by similarity.
+        """
+        self._ensure_matrix(conn)
+        if self._ids is None or not len(self._ids) or limit <= 0:
+            return []
+
+        scores = self._matrix_scores(query_embedding)
+        top = self._top_k(scores, limit)
+        return self._fetch_results(conn, self._ids[top].tolist(), scores[top].tolist())
+
+    def _ensure_matrix(self, conn: sqlite3.Connection) -> None:
+        """Load stored embeddings into the in-memory matrix if not cached or stale.
+
+        File-backed indexes map the ``.vec`` sidecar, rebuilding it from SQLite
+        first when it is missing or stale.
+
+        Args:
+            conn: Active database connection.
+        """
+        # Writes from other instances or processes bump the stored version
+        version = conn.execute("SELECT version FROM index_state WHERE id = 0").fetchone()[0]
+        if self._matrix is not None and version == self._matrix_version:
+            return
+
+        self._invalidate_matrix()
+        if self._vec_path is None:
+            self._load_matrix(conn)
+        elif not self._map_sidecar(conn):
+            self._load_matrix(conn)
+            self._write_sidecar(conn)
+        self._matrix_version = version
+
+    def _load_matrix(self, conn: sqlite3.Connection) -> None:
+        """Read every stored embedding from SQLite into the cached matrix.
+
+        Args:
+            conn: Active database connection.
+        """
+        rows = conn.execute(
+            """
+            SELECT id, embedding
+            FROM chunks
+            WHERE embedding IS NOT NULL
+            ORDER BY id
+            """
+        ).fetchall()
+
+        self._ids = np.fromiter((row["id"] for row in rows), dtype=np.int64, count=len(rows))
+        blobs = [row["embedding"] for row in rows]
+        if self.quantize:
+            self._matrix, self._scales = self._stack_int8(blobs)
+        else:
+            self._matrix = self._stack_float32(blobs)
+            self._scales = None
+
+    def _stack_float32(self, blobs: list[bytes]) -> np.ndarray:
+        """Stack stored blobs into an (N, dim) float32 matrix.
+
+        Args:
+            blobs: Embedding blobs in either storage format.
+
+        Returns:
+            Float32 matrix, one row per blob.
+        """
+        float_size = 4 * self.dimension
+        if all(len(blob) == float_size for blob in blobs):
+            return np.frombuffer(b"".join(blobs), dtype="<f4").reshape(len(blobs), self.dimension)
+        matrix = np.empty((len(blobs), self.dimension), dtype=np.float32)
+        for i, blob in enumerate(blobs):
+            matrix[i] = self._deserialize_embedding(blob)
+        return matrix
+
+    def _stack_int8(self, blobs: list[bytes]) -> tuple[np.ndarray, np.ndarray]:
+        """Stack stored blobs into an (N, dim) int8 matrix with per-row scales.
+
+        Float32 rows written before quantization was enabled are quantized on load.
+
+        Args:
+            blobs: Embedding blobs in either storage format.
+
+        Returns:
+            Tuple of (int8 matrix, float32 scales).
+        """
+        quant_size = 4 + self.dimension
+        packed = [blob if len(blob) == quant_size else self._pack_int8(
+            self._deserialize_embedding(blob)) for blob in blobs]
+        records = np.frombuffer(b"".join(packed), dtype=self._record_dtype)
+        return records["values"], records["scale"].astype(np.float32)
+
+    @property
+    def _record_dtype(self) -> np.dtype:
+        """Layout of one stored row: float32 vector, or float32 scale plus int8 values."""
+        if self.quantize:
+            return np.dtype([("scale", "<f4"), ("values", "i1", self.dimension)])
+        return np.dtype(("<f4", self.dimension))
+
+    def _map_sidecar(self, conn: sqlite3.Connection) -> bool:
+        """Memory-map the ``.vec`` file if it matches the database.
+
+        Args:
+            conn: Active database connection.
+
+        Returns:
+            True if the cached matrix now maps the file, False if it needs a rebuild.
+        """
+        meta = conn.execute("SELECT generation, row_size FROM vec_sidecar").fetchone()
+        row_size = self._record_dtype.itemsize
+        if meta is None or meta["row_size"] != row_size:
+            return False
+
+        try:
+            with open(self._vec_path, "rb") as f:
+                if f.read(_VEC_HEADER_SIZE) != meta["generation"]:
+                    return False
+            file_rows = (self._vec_path.stat().st_size - _VEC_HEADER_SIZE) // row_size
+        except OSError:
+            return False
+
+        # Chunks written without updating the sidecar (e.g. by a process
+        # without NumPy) have IDs beyond the last mapped one
+        newest = conn.execute(
+            "SELECT (SELECT MAX(id) FROM chunks) AS chunk, (SELECT MAX(id) FROM vec_offsets) AS vec"
+        ).fetchone()
+        if (newest["chunk"] or 0) > (newest["vec"] or 0):
+            return False
+
+        offsets = conn.execute(
+            "SELECT id, row FROM vec_offsets WHERE row IS NOT NULL ORDER BY id"
+        ).fetchall()
+        count = len(offsets)
+        ids = np.fromiter((o["id"] for o in offsets), dtype=np.int64, count=count)
+        live = np.fromiter((o["row"] for o in offsets), dtype=np.int64, count=count)
+        if count and live.max() >= file_rows:
+            return False
+
+        if file_rows:
+            records = np.memmap(
+                self._vec_path,
+                dtype=self._record_dtype,
+                mode="r",
+                offset=_VEC_HEADER_SIZE,
+                shape=(file_rows,),
+            )
+        else:
+            records = np.zeros(0, dtype=self._record_dtype)
+
+        if self.quantize:
+            self._matrix, self._scales = records["values"], records["scale"]
+        else:
+            self._matrix, self._scales = records.reshape(file_rows, self.dimension), None
+        self._ids, self._live = ids, live
+        return True
+
+    def _write_sidecar(self, conn: sqlite3.Connection) -> None:
+        """Rewrite the ``.vec`` file and its offsets from the cached matrix.
+
+        The file is written under a new generation token and swapped in only
+        after the offsets commit, so an interrupted rewrite is detected by
+        _map_sidecar and redone.
+
+        Args:
+            conn: Active database connection.
+        """
+        count = len(self._ids)
+        records = np.empty(count, dtype=self._record_dtype)
+        if self._scales is None:
+            records[...] = self._matrix
+        else:
+            records["scale"] = self._scales
+            records["values"] = self._matrix
+
+        generation = os.urandom(_VEC_HEADER_SIZE)
+        tmp_path = self._vec_path.with_name(self._vec_path.name + ".tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(generation)
+            f.write(records.tobytes())
+
+        conn.execute("DELETE FROM vec_offsets")
+        conn.executemany(
+            "INSERT INTO vec_offsets (id, row) VALUES (?, ?)",
+            zip(self._ids.tolist(), range(count)),
+        )
+        # Chunks without embeddings are recorded so they don't look unsynced
+        conn.execute(
+            """
+            INSERT INTO vec_offsets (id, row)
+            SELECT id, NULL FROM chunks WHERE embedding IS NULL
+            """
+        )
+        conn.execute("DELETE FROM vec_sidecar")
+        conn.execute(
+            "INSERT INTO vec_sidecar (generation, row_size) VALUES (?, ?)",
+            (generation, self._record_dtype.itemsize),
+        )
+        conn.commit()
+        os.replace(tmp_path, self._vec_path)
+
+    def _append_vectors(
+        self,
+        conn: sqlite3.Connection,
+        ids: Sequence[int],
+        blobs: Sequence[bytes],
+    ) -> None:
+        """Append newly inserted vectors to the ``.vec`` file.
+
+        Must run inside the inserting transaction, whose write lock keeps
+        concurrent writers from appending at the same offset.
+
+        Args:
+            conn: Active database connection.
+            ids: Chunk IDs, in insertion order.
+            blobs: Serialized embeddings (already in the sidecar row layout).
+        """
+        if self._vec_path is None or not self._vec_path.exists():
+            return
+
+        row_size = self._record_dtype.itemsize
+        meta = conn.execute("SELECT row_size FROM vec_sidecar").fetchone()
+        if meta is None or meta["row_size"] != row_size:
+            # The file holds another layout (e.g. written with a different
+            # quantize setting); leave it to be rebuilt on the next search
+            conn.execute("DELETE FROM vec_sidecar")
+            return
+
+        with open(self._vec_path, "r+b") as f:
+            size = f.seek(0, os.SEEK_END)
+            if size < _VEC_HEADER_SIZE:
+                return
+            # Drop any torn partial row left by an interrupted append
+            start = (size - _VEC_HEADER_SIZE) // row_size
+            f.seek(_VEC_HEADER_SIZE + start * row_size)
+            f.write(b"".join(blobs))
+            f.truncate()
+
+        conn.executemany(
+            "INSERT OR REPLACE INTO vec_offsets (id, row) VALUES (?, ?)",
+            zip(ids, range(start, start + len(ids))),
+        )
+
+    def vacuum(self) -> None:
+        """Compact the ``.vec`` file, dropping rows of deleted chunks.
+
+        Deleted chunks only lose their offset row, leaving dead rows in the
+        file. delete_by_file() vacuums automatically once they pass
+        _VEC_COMPACT_RATIO of the file. Indexes without a sidecar are unaffected.
+        """
+        if self._vec_path is None:
+            return
+        with self._connection() as conn:
+            self._invalidate_matrix()
+            self._load_matrix(conn)
+            self._write_sidecar(conn)
+            self._invalidate_matrix()
+
+    def _compact_if_sparse(self) -> None:
+        """Vacuum the ``.vec`` file once dead rows make up most of it."""
+        if self._vec_path is None:
+            return
+        try:
+            size = self._vec_path.stat().st_size
+        except OSError:
+            return
+        file_rows = (size - _VEC_HEADER_SIZE) // self._record_dtype.itemsize
+        if file_rows <= 0:
+            return
+
+        with self._connection() as conn:
+            live = conn.execute(
+                "SELECT COUNT(*) FROM vec_offsets WHERE row IS NOT NULL"
+            ).fetchone()[0]
+        if file_rows - live > file_rows * _VEC_COMPACT_RATIO:
+            self.vacuum()
+
+    def _invalidate_matrix(self) -> None:
+        """Drop the cached embedding matrix after the index changes."""
+        self._matrix = None
+        self._ids = None
+        self._scales = None
+        self._live = None
+        self._matrix_version = -1
+
+    def _matrix_scores(self, query_embedding: Sequence[float]) -> np.ndarray:
+        """Cosine similarity of the query against every cached row.
+
+        Rows are stored unit length, so after normalizing the query the scores
+        are the raw matrix-vector product.
+
+        Args:
+            query_embedding: Query vector.
+
+        Returns:
+            Score per cached row, aligned with self._ids.
+        """
+        query = np.asarray(self._normalize(query_embedding)[0], dtype=np.float32)
+
+        if self._scales is None:
+            scores = self._matrix @ query
+        else:
+            # Integer dot products accumulate in int32, then both scales are applied
+            peak = float(np.abs(query).max()) if query.size else 0.0
+            q_scale = peak / 127 if peak else 1.0
+            q_int = np.clip(np.rint(query / q_scale), -127, 127).astype(np.int8)
+            dots_int = np.einsum("ij,j->i", self._matrix, q_int, dtype=np.int32)
+            scores = dots_int.astype(np.float32) * self._scales * np.float32(q_scale)
+
+        # Mapped sidecar rows include deleted chunks; keep only live ones
+        return scores if self._live is None else scores[self._live]
+
+    @staticmethod
+    def _top_k(scores: np.ndarray, limit: int) -> np.ndarray:
+        """Indices of the highest scores, best first.
+
+        Args:
+            scores: Score array.
+            limit: Number of indices to return.
+
+        Returns:
+            Index array of length min(limit, len(scores)).
+        """
+        if limit < len(scores):
+            candidates = np.argpartition(-scores, limit - 1)[:limit]
+        else:
+            candidates = np.arange(len(scores))
+        return candidates[np.argsort(-scores[candidates], kind="stable")]
+
+    def _fetch_results(
+        self, conn: sqlite3.Connection, ids: list[int], scores: list[float]
+    ) -> list[SearchResult]:
+        """Fetch chunk rows for scored IDs in a single query.
+
+        Args:
+            conn: Active database connection.
+            ids: Chunk IDs in result order.
+            scores: Score for each ID.
+
+        Returns:
+            SearchResult objects in the order of ids.
+        """
+        if not ids:
+            return []
+
+        placeholders = ",".join("?" * len(ids))
+        rows = conn.execute(
+            f"""
+            SELECT id, file_path, text, start_line, end_line
+            FROM chunks
+            WHERE id IN ({placeholders})
+            """,
+            ids,
+        ).fetchall()
+        by_id = {row["id"]: row for row in rows}
+
+        return [
+            SearchResult(
+                file_path=by_id[chunk_id]["file_path"],
+                text=by_id[chunk_id]["text"],
+                start_line=by_id[chunk_id]["start_line"] or 0,
+                end_line=by_id[chunk_id]["end_line"] or 0,
+                score=score,
+            )
+            for chunk_id, score in zip(ids, scores)
+            if chunk_id in by_id
+        ]
+
     def hybrid_search(
         self,
         query_embedding: list[float],
@@ -432,6 +1234,11 @@ class VectorIndex:
             raise ValueError("vector_weight must be between 0 and 1")
 
         with self._connection() as conn:
+            if NUMPY_AVAILABLE and not self.has_sqlite_vec:
+                return self._hybrid_search_numpy(
+                    conn, query_embedding, query_text, limit, vector_weight
+                )
+
             # Get vector search results
             if self.has_sqlite_vec:
                 vector_results = self._search_sqlite_vec(
@@ -450,6 +1257,61 @@ class VectorIndex:
                 vector_results, bm25_results, vector_weight, limit
             )
 
+    def _hybrid_search_numpy(
+        self,
+        conn: sqlite3.Connection,
+        query_embedding: Sequence[float],
+        query_text: str,
+        limit: int,
+        vector_weight: float,
+    ) -> list[SearchResult]:
+        """Hybrid search fused in NumPy over the cached embedding matrix.
+
+        Candidates are the vector top ``2 * limit`` plus the BM25 top
+        ``2 * limit``. Every candidate is scored with its exact cosine similarity
+        and normalized BM25 score, and only the final rows are fetched.
+
+        Args:
+            conn: Active database connection.
+            query_embedding: Query vector for semantic search.
+            query_text: Query text for BM25 full-text search.
+            limit: Maximum number of results to return.
+            vector_weight: Weight for vector similarity (0-1), BM25 gets remainder.
+
+        Returns:
+            List of SearchResult objects ordered by combined score.
+        """
+        if limit <= 0:
+            return []
+
+        bm25 = self._bm25_ranks(conn, query_text, limit * 2)
+        bm25_ids = np.fromiter((chunk_id for chunk_id, _ in bm25), dtype=np.int64, count=len(bm25))
+        bm25_scores = np.fromiter((score for _, score in bm25), dtype=np.float32, count=len(bm25))
+
+        self._ensure_matrix(conn)
+        if self._ids is not None and len(self._ids):
+            scores = self._matrix_scores(query_embedding)
+            vector_ids = self._ids[self._top_k(scores, limit * 2)]
+        else:
+            scores = np.zeros(0, dtype=np.float32)
+            vector_ids = np.zeros(0, dtype=np.int64)
+
+        candidates = np.union1d(vector_ids, bm25_ids)
+
+        # Cached ids are sorted, so each candidate's matrix row is a binary search away
+        vector_part = np.zeros(len(candidates), dtype=np.float32)
+        if len(scores):
+            rows = np.minimum(np.searchsorted(self._ids, candidates), len(self._ids) - 1)
+            has_vector = self._ids[rows] == candidates
+            vector_part[has_vector] = scores[rows[has_vector]]
+
+        bm25_part = np.zeros(len(candidates), dtype=np.float32)
+        bm25_part[np.searchsorted(candidates, bm25_ids)] = bm25_scores
+
+        fused = vector_weight * vector_part + (1.0 - vector_weight) * bm25_part
+        top = self._top_k(fused, limit)
+        return self._fetch_results(conn, candidates[top].tolist(), fused[top].tolist())
+
     def _search_bm25(
         self, conn: sqlite3.Connection, query_text: str, limit: int
     ) -> list[SearchResult]:
@@ -463,23 +1325,37 @@ class VectorIndex:
         Returns:
             List of SearchResult objects.
         """
+        ranks = self._bm25_ranks(conn, query_text, limit)
+        return self._fetch_results(
+            conn, [chunk_id for chunk_id, _ in ranks], [score for _, score in ranks]
+        )
+
+    def _bm25_ranks(
+        self, conn: sqlite3.Connection, query_text: str, limit: int
+    ) -> list[tuple[int, float]]:
+        """Rank chunk IDs with FTS5 BM25.
+
+        Args:
+            conn: Active database connection.
+            query_text: Query text for full-text search.
+            limit: Maximum results.
+
+        Returns:
+            (chunk_id, score) pairs, best first, with scores normalized to 0-1.
+        """
         # Escape special FTS5 characters and prepare query
         # FTS5 uses double quotes for phrase matching
         safe_query = query_text.replace('"', '""')
+        sql = """
+            SELECT rowid AS id, bm25(fts_chunks) AS rank
+            FROM fts_chunks
+            WHERE fts_chunks MATCH ?
+            ORDER BY rank ASC
+            LIMIT ?
+        """
 
         try:
-            rows = conn.execute(
-                """
-                SELECT c.file_path, c.text, c.start_line, c.end_line,
-                       bm25(fts_chunks) as rank
-                FROM fts_chunks f
-                JOIN chunks c ON c.id = f.rowid
-                WHERE fts_chunks MATCH ?
-                ORDER BY rank ASC
-                LIMIT ?
-                """,
-                (f'"{safe_query}"', limit),
-            ).fetchall()
+            rows = conn.execute(sql, (f'"{safe_query}"', limit)).fetchall()
 
             if not rows:
                 # Try with individual words if phrase match fails
@@ -488,43 +1364,23 @@ class VectorIndex:
                     word_query = " OR ".join(
                         f'"{w.replace(chr(34), chr(34)+chr(34))}"' for w in words
                     )
-                    rows = conn.execute(
-                        """
-                        SELECT c.file_path, c.text, c.start_line, c.end_line,
-                               bm25(fts_chunks) as rank
-                        FROM fts_chunks f
-                        JOIN chunks c ON c.id = f.rowid
-                        WHERE fts_chunks MATCH ?
-                        ORDER BY rank ASC
-                        LIMIT ?
-                        """,
-                        (word_query, limit),
-                    ).fetchall()
-
-            # Normalize BM25 scores (they're negative, lower is better)
-            if rows:
-                min_rank = min(row["rank"] for row in rows)
-                max_rank = max(row["rank"] for row in rows)
-                rank_range = max_rank - min_rank if max_rank != min_rank else 1.0
-
-                return [
-                    SearchResult(
-                        file_path=row["file_path"],
-                        text=row["text"],
-                        start_line=row["start_line"] or 0,
-                        end_line=row["end_line"] or 0,
-                        # Normalize to 0-1 range (inverted since lower rank is better)
-                        score=1.0 - ((row["rank"] - min_rank) / rank_range),
-                    )
-                    for row in rows
-                ]
-
-            return []
+                    rows = conn.execute(sql, (word_query, limit)).fetchall()
 
         except sqlite3.OperationalError as e:
             logger.warning("BM25 search failed: %s", e)
             return []
 
+        if not rows:
+            return []
+
+        # Normalize BM25 scores (they're negative, lower is better)
+        min_rank = min(row["rank"] for row in rows)
+        max_rank = max(row["rank"] for row in rows)
+        rank_range = max_rank - min_rank if max_rank != min_rank else 1.0
+
+        # Normalize to 0-1 range (inverted since lower rank is better)
+        return [(row["id"], 1.0 - ((row["rank"] - min_rank) / rank_range)) for row in rows]
+
     def _combine_search_results(
         self,
         vector_results: list[SearchResult],
@@ -617,8 +1473,13 @@ class VectorIndex:
             )
 
             deleted = cursor.rowcount
+            if deleted:
+                self._invalidate_matrix()
             logger.debug("Deleted %d chunks for file: %s", deleted, file_path)
-            return deleted
+
+        if deleted:
+            self._compact_if_sparse()
+        return deleted
 
     def get_indexed_files(self) -> list[str]:
         """Get list of all indexed files.
@@ -650,6 +1511,12 @@ class VectorIndex:
 
             # Clear main table
             conn.execute("DELETE FROM chunks")
+            self._invalidate_matrix()
+
+            # Drop the sidecar; it is rebuilt empty on the next search
+            conn.execute("DELETE FROM vec_sidecar")
+            if self._vec_path is not None:
+                self._vec_path.unlink(missing_ok=True)
 
             logger.info("Vector index cleared")
 
@@ -1,6 +1,8 @@
 """Memory store for managing Markdown-based memory files (OpenClaw-style)."""
 
+from bisect import bisect_left, bisect_right
 from datetime import datetime
+from itertools import accumulate
 from pathlib import Path
 
 
@@ -155,7 +157,7 @@ class MemoryStore:
         Returns:
             List of chunk dicts with keys: text, file, start_line, end_line.
         """
-        if not text.strip():
+        if not text or not text.strip():
             return []
 
         # Approximate chars per token (~4 chars)
@@ -164,52 +166,29 @@ class MemoryStore:
         overlap_chars = overlap * chars_per_token
 
         lines = text.splitlines(keepends=True)
+        # offsets[i] is the char offset where line i starts; offsets[-1] is the total
+        offsets = [0, *accumulate(map(len, lines))]
+        num_lines = len(lines)
         chunks: list[dict] = []
 
-        current_chunk: list[str] = []
-        current_chars = 0
-        chunk_start_line = 1
-        line_num = 1
-
-        for line in lines:
-            line_len = len(line)
-
-            # If adding this line exceeds chunk size and we have content
-            if current_chars + line_len > chunk_chars and current_chunk:
-                chunk_text = "".join(current_chunk)
-                chunks.append({
-                    "text": chunk_text.strip(),
-                    "file": file_name,
-                    "start_line": chunk_start_line,
-                    "end_line": line_num - 1,
-                })
-
-                # Calculate overlap: find lines to keep for overlap
-                overlap_lines: list[str] = []
-                overlap_len = 0
-                for prev_line in reversed(current_chunk):
-                    if overlap_len + len(prev_line) > overlap_chars:
-                        break
-                    overlap_lines.insert(0, prev_line)
-                    overlap_len += len(prev_line)
-
-                current_chunk = overlap_lines
-                current_chars = overlap_len
-                chunk_start_line = line_num - len(overlap_lines)
-
-            current_chunk.append(line)
-            current_chars += line_len
-            line_num += 1
-
-        # Don't forget the last chunk
-        if current_chunk:
-            chunk_text = "".join(current_chunk)
+        start = 0  # First line of the current chunk (including overlap lines)
+        forced = 0  # Line that opened the chunk; always included even if oversized
+        while True:
+            # Extend the chunk while the running size stays within chunk_chars
+            fit = bisect_right(offsets, offsets[start] + chunk_chars, start, num_lines + 1) - 1
+            end = max(forced + 1, fit)
             chunks.append({
-                "text": chunk_text.strip(),
+                "text": "".join(lines[start:end]).strip(),
                 "file": file_name,
-                "start_line": chunk_start_line,
-                "end_line": line_num - 1,
+                "start_line": start + 1,
+                "end_line": end,
             })
+            if end >= num_lines:
+                break
+
+            # Next chunk re-uses the longest tail of this one that fits in overlap_chars
+            start = bisect_left(offsets, offsets[end] - overlap_chars, start, end + 1)
+            forced = end
 
         return chunks
 
@@ -228,6 +207,10 @@ class MemoryStore:
         if not file_path.exists():
             return []
 
+        # Skip the read entirely for freshly created empty files
+        if file_path.stat().st_size == 0:
+            return []
+
         text = file_path.read_text(encoding="utf-8")
         return self.chunk_text(
             text,
@@ -4,15 +4,19 @@ import asyncio
 import copy
 import json
 import os
-import uuid
 import warnings
-from typing import Any
+from typing import Any, ClassVar
 
 from lazyllm import OnlineModule
 from lazyllm.components import FunctionCallFormatter
 
 
 from icron.providers.base import LLMProvider, LLMResponse, ToolCallRequest
+from icron.providers.ratelimit import TokenBucket
+
+
+# Accepted spellings of model_type mapped to the LazyLLM type name
+_MODEL_TYPES = {"LLM": "LLM", "VLM": "VLM", "llm": "LLM", "vlm": "VLM"}
 
 
 class LazyLLMProvider(LLMProvider):
@@ -22,9 +26,9 @@ class LazyLLMProvider(LLMProvider):
     Supports chat models with `type="LLM"` and vision-language models with `type="VLM"`.
     """
 
-    SUPPORTED_TYPES = {"LLM", "VLM"}
+    SUPPORTED_TYPES: ClassVar[frozenset[str]] = frozenset({"LLM", "VLM"})
     # Best-effort source list from LazyLLM online suppliers (non-exhaustive across versions).
-    KNOWN_SOURCES = (
+    KNOWN_SOURCES_TUPLE: ClassVar[tuple[str, ...]] = (
         "aiping",
         "deepseek",
         "doubao",
@@ -37,6 +41,7 @@ class LazyLLMProvider(LLMProvider):
         "sensenova",
         "siliconflow",
     )
+    KNOWN_SOURCES: ClassVar[frozenset[str]] = frozenset(KNOWN_SOURCES_TUPLE)
 
     def __init__(
         self,
@@ -45,6 +50,8 @@ class LazyLLMProvider(LLMProvider):
         default_model: str = "qwen-plus",
         source: str | None = None,
         model_type: str = "LLM",
+        rps: float | None = None,
+        burst: int | None = None,
     ):
         super().__init__(api_key, api_base)
         self.default_model = default_model
@@ -52,25 +59,23 @@ class LazyLLMProvider(LLMProvider):
         if self.source and self.source not in self.KNOWN_SOURCES:
             warnings.warn(
                 f"Unknown lazyllm source '{self.source}'. "
-                f"Known sources: {', '.join(self.KNOWN_SOURCES)}",
+                f"Known sources: {', '.join(sorted(self.KNOWN_SOURCES))}",
                 stacklevel=2,
             )
-        self.model_type = self._normalize_type(model_type)
+        normalized = _MODEL_TYPES.get(model_type) or _MODEL_TYPES.get(model_type.upper())
+        if normalized is None:
+            raise ValueError(
+                f"Unsupported LazyLLM model type: {model_type}. "
+                f"Supported values: {sorted(self.SUPPORTED_TYPES)}"
+            )
+        self.model_type = normalized
+        self._bucket = TokenBucket(rps, burst) if rps else None
         self.client = self._create_client(
             model=self.default_model,
             source=self.source,
             model_type=self.model_type,
         )
 
-    def _normalize_type(self, model_type: str) -> str:
-        normalized = model_type.upper()
-        if normalized not in self.SUPPORTED_TYPES:
-            raise ValueError(
-                f"Unsupported LazyLLM model type: {model_type}. "
-                f"Supported values: {sorted(self.SUPPORTED_TYPES)}"
-            )
-        return normalized
-
     def _create_client(self, model: str, source: str | None, model_type: str) -> Any:
         if OnlineModule is None:
             raise ImportError(
@@ -106,14 +111,17 @@ class LazyLLMProvider(LLMProvider):
             role = msg.get("role", "user")
             if role == "system":
                 content = msg.get("content", "")
+                # Keep only non-empty, already-stripped parts so the join needs no cleanup pass
                 if isinstance(content, str):
+                    content = content.strip()
+                elif content:
+                    content = json.dumps(content, ensure_ascii=False)
+                if content:
                     system_parts.append(content)
-                else:
-                    system_parts.append(json.dumps(content, ensure_ascii=False))
             else:
                 conversation.append(copy.deepcopy(msg))
 
-        system_prompt = "\n\n".join(part for part in system_parts if part).strip()
+        system_prompt = "\n\n".join(system_parts)
 
         if not conversation:
             return system_prompt, [], ""
@@ -145,7 +153,10 @@ class LazyLLMProvider(LLMProvider):
             content = str(content)
 
         tool_calls: list[ToolCallRequest] = []
-        for idx, tc in enumerate(response.get("tool_calls") or []):
+        raw_tool_calls = response.get("tool_calls") or []
+        # One urandom draw covers fallback IDs for every call (8 hex chars each)
+        id_suffixes = os.urandom(4 * len(raw_tool_calls)).hex() if raw_tool_calls else ""
+        for idx, tc in enumerate(raw_tool_calls):
             if not isinstance(tc, dict):
                 continue
 
@@ -169,7 +180,7 @@ class LazyLLMProvider(LLMProvider):
 
             tool_calls.append(
                 ToolCallRequest(
-                    id=tc.get("id") or f"call_{uuid.uuid4().hex[:8]}_{idx}",
+                    id=tc.get("id") or f"call_{id_suffixes[idx * 8:(idx + 1) * 8]}_{idx}",
                     name=name,
                     arguments=arguments,
                 )
@@ -226,6 +237,8 @@ class LazyLLMProvider(LLMProvider):
             kwargs["tool_choice"] = "auto"
 
         try:
+            if self._bucket is not None:
+                await self._bucket.acquire()
             response = await asyncio.to_thread(client, current_input, **kwargs)
             parsed = self._parse_response(response)
             return parsed
@@ -242,4 +255,4 @@ class LazyLLMProvider(LLMProvider):
     @classmethod
     def get_known_sources(cls) -> tuple[str, ...]:
         """Get built-in known lazyllm sources (best-effort list)."""
-        return cls.KNOWN_SOURCES
+        return cls.KNOWN_SOURCES_TUPLE
@@ -1,11 +1,23 @@
 """Native OpenAI provider implementation."""
 
+import json
 import logging
-from typing import Any
+import threading
+from typing import Any, AsyncIterator
 
-from openai import AsyncOpenAI, APITimeoutError, APIError, RateLimitError, AuthenticationError
+import httpx
+from openai import (
+    AsyncOpenAI,
+    APITimeoutError,
+    APIError,
+    DefaultAsyncHttpxClient,
+    RateLimitError,
+    AuthenticationError,
+)
 
 from icron.providers.base import LLMProvider, LLMResponse, ToolCallRequest
+from icron.providers.ratelimit import TokenBucket, parse_reset_duration
+from icron.utils.helpers import HTTP2_AVAILABLE
 
 logger = logging.getLogger(__name__)
 
@@ -13,6 +25,49 @@ logger = logging.getLogger(__name__)
 DEFAULT_TIMEOUT = 120
 
 
+class _SharedHttpxClient(DefaultAsyncHttpxClient):
+    """Pooled client that individual AsyncOpenAI instances cannot close.
+
+    AsyncOpenAI.close() (and ``async with provider.client``) calls aclose() on
+    its http_client, which would tear down the pool for every other provider.
+    Only OpenAIProvider.close_shared() really closes it, via _close_pool().
+    """
+
+    async def aclose(self) -> None:
+        """Ignore per-provider close requests; the pool is process-wide."""
+
+    async def _close_pool(self) -> None:
+        """Close the underlying connection pool."""
+        await super().aclose()
+
+
+# Process-wide connection pools keyed by timeout, shared by all OpenAIProvider instances
+_SHARED_HTTP_CLIENTS: dict[float, _SharedHttpxClient] = {}
+_SHARED_HTTP_LOCK = threading.Lock()
+
+
+def _get_shared_http_client(timeout: float) -> _SharedHttpxClient:
+    """
+    Get or create the shared HTTP client for a timeout value.
+
+    Args:
+        timeout: Request timeout in seconds.
+
+    Returns:
+        Pooled httpx client reused across provider instances.
+    """
+    with _SHARED_HTTP_LOCK:
+        client = _SHARED_HTTP_CLIENTS.get(timeout)
+        if client is None or client.is_closed:
+            client = _SharedHttpxClient(
+                timeout=timeout,
+                limits=httpx.Limits(max_keepalive_connections=100, max_connections=200),
+                http2=HTTP2_AVAILABLE,
+            )
+            _SHARED_HTTP_CLIENTS[timeout] = client
+        return client
+
+
 class OpenAIProvider(LLMProvider):
     """
     Native OpenAI provider with OpenAI-compatible API support.
@@ -31,6 +86,9 @@ class OpenAIProvider(LLMProvider):
         api_base: str | None = None,
         default_model: str = "gpt-4o",
         timeout: int = DEFAULT_TIMEOUT,
+        rps: float | None = None,
+        burst: int | None = None,
+        shared_pool: bool = True,
     ):
         """
         Initialize OpenAI provider.
@@ -40,6 +98,10 @@ class OpenAIProvider(LLMProvider):
             api_base: Custom base URL for compatible providers.
             default_model: Default model to use.
             timeout: Request timeout in seconds.
+            rps: Optional client-side request rate limit (requests per second).
+            burst: Maximum burst size for the rate limiter (defaults to ceil(rps)).
+            shared_pool: Reuse the process-wide HTTP connection pool so warm
+                TLS/HTTP2 connections are shared with other provider instances.
         """
         super().__init__(api_key, api_base)
         self.default_model = default_model
@@ -53,8 +115,23 @@ class OpenAIProvider(LLMProvider):
             client_kwargs["api_key"] = api_key
         if api_base:
             client_kwargs["base_url"] = api_base
+        if shared_pool:
+            client_kwargs["http_client"] = _get_shared_http_client(timeout)
 
         self.client = AsyncOpenAI(**client_kwargs)
+        # Bound once so chat() skips the client.chat.completions attribute chain
+        self._create = self.client.chat.completions.create
+        self._create_raw = self.client.chat.completions.with_raw_response.create
+        self._bucket = TokenBucket(rps, burst) if rps else None
+
+    @classmethod
+    async def close_shared(cls) -> None:
+        """Close the shared HTTP connection pools (call on shutdown)."""
+        with _SHARED_HTTP_LOCK:
+            clients = list(_SHARED_HTTP_CLIENTS.values())
+            _SHARED_HTTP_CLIENTS.clear()
+        for client in clients:
+            await client._close_pool()
 
     async def chat(
         self,
@@ -83,54 +160,207 @@ class OpenAIProvider(LLMProvider):
         """
         model = model or self.default_model
 
-        # Build request kwargs
         request_kwargs: dict[str, Any] = {
             "model": model,
             "messages": messages,
             "max_tokens": max_tokens,
             "temperature": temperature,
+            **({"tools": tools} if tools else {}),
+            **({"top_p": top_p} if top_p is not None else {}),
         }
 
-        if tools:
-            request_kwargs["tools"] = tools
+        try:
+            if self._bucket is None:
+                response = await self._create(**request_kwargs)
+            else:
+                # Raw response exposes the rate-limit headers used to sync the bucket
+                await self._bucket.acquire()
+                raw_response = await self._create_raw(**request_kwargs)
+                self._update_bucket(raw_response.headers)
+                response = raw_response.parse()
+            return self._parse_response(response)
+        except Exception as e:
+            return self._error_response(e)
 
-        if top_p is not None:
-            request_kwargs["top_p"] = top_p
+    async def chat_stream(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        model: str | None = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+        top_p: float | None = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[LLMResponse]:
+        """
+        Stream a chat completion request via OpenAI API.
+
+        Yields one LLMResponse per content delta as soon as it arrives. Tool-call
+        argument fragments are buffered and decoded once the stream ends; the final
+        response carries the finish_reason, the assembled tool calls and usage.
+
+        Args:
+            messages: List of message dicts with 'role' and 'content'.
+            tools: Optional list of tool definitions in OpenAI format.
+            model: Model identifier.
+            max_tokens: Maximum tokens in response.
+            temperature: Sampling temperature (0-2).
+            top_p: Nucleus sampling parameter.
+            **kwargs: Additional provider-specific parameters.
+
+        Yields:
+            LLMResponse deltas; the last one has a non-empty finish_reason.
+        """
+        model = model or self.default_model
+
+        request_kwargs: dict[str, Any] = {
+            "model": model,
+            "messages": messages,
+            "max_tokens": max_tokens,
+            "temperature": temperature,
+            "stream": True,
+            "stream_options": {"include_usage": True},
+            **({"tools": tools} if tools else {}),
+            **({"top_p": top_p} if top_p is not None else {}),
+        }
 
+        # Per tool-call index: [id, name, argument fragments]
+        pending: dict[int, list[Any]] = {}
+        final_content = ""
+        finish_reason = ""
+        usage: dict[str, int] = {}
+        stream = None
         try:
-            response = await self.client.chat.completions.create(**request_kwargs)
-            return self._parse_response(response)
-        except AuthenticationError as e:
-            logger.error(f"OpenAI authentication error: {e}", exc_info=True)
-            return LLMResponse(
-                content="OpenAI API authentication failed. Check your API key.",
-                finish_reason="error",
-            )
-        except RateLimitError as e:
-            logger.error(f"OpenAI rate limit error: {e}", exc_info=True)
-            return LLMResponse(
-                content="OpenAI API rate limit exceeded. Please try again later.",
-                finish_reason="error",
-            )
-        except APITimeoutError as e:
-            logger.error(f"OpenAI timeout error: {e}", exc_info=True)
-            return LLMResponse(
-                content=f"OpenAI API timeout after {self.timeout}s",
-                finish_reason="error",
-            )
-        except APIError as e:
-            logger.error(f"OpenAI API error: {e}", exc_info=True)
-            return LLMResponse(
-                content=f"OpenAI API error: {e.message}",
-                finish_reason="error",
-            )
+            if self._bucket is not None:
+                await self._bucket.acquire()
+            stream = await self._create(**request_kwargs)
+            async for chunk in stream:
+                # With include_usage, token counts arrive on a last chunk without choices
+                if getattr(chunk, "usage", None):
+                    usage = self._parse_usage(chunk.usage)
+                if not chunk.choices:
+                    continue
+                choice = chunk.choices[0]
+                delta = choice.delta
+
+                for tc in getattr(delta, "tool_calls", None) or []:
+                    entry = pending.setdefault(tc.index, [None, None, []])
+                    if tc.id:
+                        entry[0] = tc.id
+                    if tc.function is not None:
+                        if tc.function.name:
+                            entry[1] = tc.function.name
+                        if tc.function.arguments:
+                            entry[2].append(tc.function.arguments)
+
+                if choice.finish_reason:
+                    finish_reason = choice.finish_reason
+                    final_content = delta.content or ""
+                elif delta.content:
+                    yield LLMResponse(content=delta.content, finish_reason="")
         except Exception as e:
-            logger.exception("Unexpected OpenAI API error")
+            yield self._error_response(e)
+            return
+        finally:
+            # Release the HTTP response on early exit or cancellation too
+            if stream is not None:
+                await stream.close()
+
+        # Flushed even when the stream ended without a finish_reason chunk
+        tool_calls = [
+            ToolCallRequest(
+                id=tc_id or f"call_{idx}",
+                name=name or "",
+                arguments=self._decode_arguments("".join(fragments)),
+            )
+            for idx, (tc_id, name, fragments) in sorted(pending.items())
+        ]
+        yield LLMResponse(
+            content=final_content,
+            tool_calls=tool_calls,
+            finish_reason=finish_reason or ("tool_calls" if tool_calls else "stop"),
+            usage=usage,
+        )
+
+    def _error_response(self, error: Exception) -> LLMResponse:
+        """
+        Log an OpenAI API error and convert it into an error LLMResponse.
+
+        Args:
+            error: Exception raised by the OpenAI client.
+
+        Returns:
+            LLMResponse with finish_reason "error" and a user-facing message.
+        """
+        if isinstance(error, AuthenticationError):
+            logger.error("OpenAI authentication error: %s", error)
+            content = "OpenAI API authentication failed. Check your API key."
+        elif isinstance(error, RateLimitError):
+            logger.warning("OpenAI rate limit error: %s", error)
+            if self._bucket is not None:
+                retry_after = parse_reset_duration(error.response.headers.get("retry-after"))
+                self._bucket.penalize(retry_after if retry_after is not None else 1.0)
+            content = "OpenAI API rate limit exceeded. Please try again later."
+        elif isinstance(error, APITimeoutError):
+            logger.warning("OpenAI timeout error: %s", error)
+            content = f"OpenAI API timeout after {self.timeout}s"
+        elif isinstance(error, APIError):
+            logger.error("OpenAI API error: %s", error)
+            content = f"OpenAI API error: {error.message}"
+        else:
+            logger.error("Unexpected OpenAI API error", exc_info=error)
             return LLMResponse(
-                content=f"Error calling OpenAI API: {str(e)}",
+                content=f"Error calling OpenAI API: {str(error)}",
                 finish_reason="error",
             )
 
+        # Expected API errors only carry a traceback when debug logging is on
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("OpenAI API error details", exc_info=error)
+        return LLMResponse(content=content, finish_reason="error")
+
+    def _update_bucket(self, headers: Any) -> None:
+        """
+        Sync the rate limiter with the server's remaining request quota.
+
+        Args:
+            headers: Response headers from the OpenAI API.
+        """
+        remaining = headers.get("x-ratelimit-remaining-requests")
+        if remaining is None or self._bucket is None:
+            return
+        try:
+            remaining_requests = int(remaining)
+        except ValueError:
+            return
+        reset_after = parse_reset_duration(headers.get("x-ratelimit-reset-requests"))
+        self._bucket.update(remaining_requests, reset_after)
+
+    @staticmethod
+    def _decode_arguments(raw: Any) -> dict[str, Any]:
+        """
+        Decode tool-call arguments into a dict.
+
+        Args:
+            raw: JSON string/bytes from the API, or an already-decoded value.
+
+        Returns:
+            Decoded arguments, or {"raw": raw} when the JSON is invalid. Null
+            decodes to {} and other non-object values are wrapped as {"value": ...}.
+        """
+        if isinstance(raw, (str, bytes)):
+            try:
+                arguments = json.loads(raw) if raw else None
+            except json.JSONDecodeError:
+                return {"raw": raw}
+        else:
+            arguments = raw
+        if arguments is None:
+            return {}
+        if not isinstance(arguments, dict):
+            return {"value": arguments}
+        return arguments
+
     def _parse_response(self, response: Any) -> LLMResponse:
         """
         Parse OpenAI response into our standard format.
@@ -151,17 +381,13 @@ class OpenAIProvider(LLMProvider):
                 tool_calls.append(ToolCallRequest(
                     id=tc.id,
                     name=tc.function.name,
-                    arguments=tc.function.arguments,
+                    arguments=self._decode_arguments(tc.function.arguments),
                 ))
 
         # Parse usage
         usage = {}
         if hasattr(response, "usage") and response.usage:
-            usage = {
-                "prompt_tokens": response.usage.prompt_tokens,
-                "completion_tokens": response.usage.completion_tokens,
-                "total_tokens": response.usage.total_tokens,
-            }
+            usage = self._parse_usage(response.usage)
 
         # Map finish_reason
         finish_reason = choice.finish_reason or "stop"
@@ -173,6 +399,23 @@ class OpenAIProvider(LLMProvider):
             usage=usage,
         )
 
+    @staticmethod
+    def _parse_usage(usage: Any) -> dict[str, int]:
+        """
+        Convert an OpenAI usage object into a token count dict.
+
+        Args:
+            usage: Usage object from a completion or the last stream chunk.
+
+        Returns:
+            Dict with prompt_tokens, completion_tokens and total_tokens.
+        """
+        return {
+            "prompt_tokens": usage.prompt_tokens,
+            "completion_tokens": usage.completion_tokens,
+            "total_tokens": usage.total_tokens,
+        }
+
     def get_default_model(self) -> str:
         """Get the default model."""
         return self.default_model
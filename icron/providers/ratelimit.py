@@ -0,0 +1,110 @@
+"""Client-side rate limiting for LLM providers."""
+
+import asyncio
+import math
+import re
+from time import monotonic
+
+# Matches OpenAI-style reset durations such as "1s", "6m0s", "20ms" or "1h2m3.5s"
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+_DURATION_UNITS = {"h": 3600.0, "m": 60.0, "s": 1.0, "ms": 0.001}
+
+
+def parse_reset_duration(value: str | None) -> float | None:
+    """
+    Parse a rate-limit reset header into seconds.
+
+    Args:
+        value: Header value, either plain seconds ("2", "0.5") or an
+            OpenAI-style duration ("6m0s", "20ms").
+
+    Returns:
+        Delay in seconds, or None if the value is missing or unparseable.
+    """
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    parts = _DURATION_PART.findall(value)
+    if not parts:
+        return None
+    return sum(float(amount) * _DURATION_UNITS[unit] for amount, unit in parts)
+
+
+class TokenBucket:
+    """
+    Async token bucket limiting requests to a steady rate with bursts.
+
+    Callers await acquire() before each request. Server feedback (remaining
+    quota, Retry-After) can shrink the bucket or pause it so doomed requests
+    are never sent.
+    """
+
+    def __init__(self, rate: float, burst: int | None = None) -> None:
+        """
+        Initialize the bucket.
+
+        Args:
+            rate: Sustained requests per second.
+            burst: Maximum tokens held at once (defaults to ceil(rate), at least 1).
+
+        Raises:
+            ValueError: If rate is not positive.
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.capacity = float(burst or max(1, math.ceil(rate)))
+        self._tokens = self.capacity
+        self._updated = monotonic()
+        self._blocked_until = 0.0
+        self._lock = asyncio.Lock()
+
+    def _refill(self, now: float) -> None:
+        """Add tokens accrued since the last refill."""
+        elapsed = now - self._updated
+        if elapsed > 0:
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+            self._updated = now
+
+    async def acquire(self) -> None:
+        """Wait until a request may be sent and consume one token."""
+        async with self._lock:
+            while True:
+                now = monotonic()
+                if now < self._blocked_until:
+                    await asyncio.sleep(self._blocked_until - now)
+                    continue
+                self._refill(now)
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+    def penalize(self, delay: float) -> None:
+        """
+        Pause the bucket, e.g. after a 429 with Retry-After.
+
+        Args:
+            delay: Seconds to wait before the next request may be sent.
+        """
+        self._blocked_until = max(self._blocked_until, monotonic() + delay)
+        self._tokens = 0.0
+        self._updated = self._blocked_until
+
+    def update(self, remaining: int | None, reset_after: float | None) -> None:
+        """
+        Sync the bucket with quota reported by the server.
+
+        Args:
+            remaining: Requests left in the current server window.
+            reset_after: Seconds until the server window resets.
+        """
+        if remaining is None:
+            return
+        self._tokens = min(self._tokens, float(remaining))
+        if remaining <= 0 and reset_after:
+            self.penalize(reset_after)
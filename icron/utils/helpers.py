@@ -2,8 +2,12 @@
 
 from pathlib import Path
 from datetime import datetime, timezone
+import importlib.util
 import os
 
+# HTTP/2 needs the optional h2 package (httpx[http2])
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
 
 def ensure_dir(path: Path) -> Path:
     """Ensure a directory exists, creating it if necessary."""
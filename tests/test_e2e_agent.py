@@ -1,4 +1,3 @@
-import asyncio
 import os
 
 import pytest
@@ -12,20 +11,26 @@ API_KEY = os.getenv("ICRON_TEST_DOUBAO_API_KEY", "")
 MODEL = "doubao-seed-1-8-251228"
 
 
-def test_agent_loop_minimal_e2e(tmp_path):
+@pytest.fixture(scope="module")
+def provider():
+    """One LazyLLMProvider per module so OnlineModule client setup is paid once."""
     if not API_KEY:
         pytest.skip("Set ICRON_TEST_DOUBAO_API_KEY to run real network E2E.")
+    return LazyLLMProvider(
+        api_key=API_KEY,
+        source=SOURCE,
+        default_model=MODEL,
+        model_type="LLM",
+    )
+
+
+@pytest.mark.asyncio(loop_scope="module")
+async def test_agent_loop_minimal_e2e(tmp_path, provider):
     workspace = tmp_path / "workspace"
     workspace.mkdir(parents=True, exist_ok=True)
     target_file = workspace / "note.txt"
     target_file.write_text("hello-e2e", encoding="utf-8")
 
-    provider = LazyLLMProvider(
-        api_key=API_KEY,
-        source=SOURCE,
-        default_model=MODEL,
-        type="LLM",
-    )
     bus = MessageBus()
     agent = AgentLoop(
         bus=bus,
@@ -36,11 +41,9 @@ def test_agent_loop_minimal_e2e(tmp_path):
         brave_api_key=None,
     )
 
-    output = asyncio.run(
-        agent.process_direct(
-            f"请调用 read_file 工具读取文件 {target_file}，并只回复文件原文，不要添加任何其他内容。",
-            session_key=f"cli:e2e-{tmp_path.name}",
-        )
+    output = await agent.process_direct(
+        f"请调用 read_file 工具读取文件 {target_file}，并只回复文件原文，不要添加任何其他内容。",
+        session_key=f"cli:e2e-{tmp_path.name}",
     )
     print(f"\nE2E output:\n{output}\n")
     assert output
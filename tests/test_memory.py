@@ -6,11 +6,15 @@ Tests cover:
 - VectorIndex (index.py): Vector storage and search
 """
 
+import asyncio
 from datetime import datetime
+import json
 from pathlib import Path
+import sqlite3
 from unittest.mock import AsyncMock, MagicMock, patch
 import struct
 
+import httpx
 import pytest
 
 from icron.memory.store import MemoryStore
@@ -23,7 +27,8 @@ from icron.memory.embeddings import (
     get_embedding_provider,
     SENTENCE_TRANSFORMERS_AVAILABLE,
 )
-from icron.memory.index import VectorIndex, SearchResult
+from icron.memory.index import NUMPY_AVAILABLE, VectorIndex, SearchResult
+from icron.memory.cache import EmbeddingCache, RedisEmbeddingCache, embedding_cache_key
 
 
 # =============================================================================
@@ -220,6 +225,14 @@ class TestMemoryStore:
 # =============================================================================
 
 
+@pytest.fixture(scope="session")
+def shared_local_embedder() -> LocalEmbedding:
+    """Single LocalEmbedding reused across tests so the model loads once."""
+    if not SENTENCE_TRANSFORMERS_AVAILABLE:
+        pytest.skip("sentence-transformers not installed")
+    return LocalEmbedding()
+
+
 class TestLocalEmbedding:
     """Tests for LocalEmbedding provider."""
 
@@ -228,9 +241,9 @@ class TestLocalEmbedding:
         reason="sentence-transformers not installed"
     )
     @pytest.mark.asyncio
-    async def test_local_embedding_dimension(self) -> None:
+    async def test_local_embedding_dimension(self, shared_local_embedder: LocalEmbedding) -> None:
         """Test that LocalEmbedding returns correct dimension."""
-        provider = LocalEmbedding()
+        provider = shared_local_embedder
         
         # Check default dimension
         assert provider.dimension == 384
@@ -245,9 +258,9 @@ class TestLocalEmbedding:
         reason="sentence-transformers not installed"
     )
     @pytest.mark.asyncio
-    async def test_local_embedding_batch(self) -> None:
+    async def test_local_embedding_batch(self, shared_local_embedder: LocalEmbedding) -> None:
         """Test batch embedding with LocalEmbedding."""
-        provider = LocalEmbedding()
+        provider = shared_local_embedder
         
         texts = ["Hello world", "Testing batch embeddings", "Third text"]
         embeddings = await provider.embed_batch(texts)
@@ -260,6 +273,20 @@ class TestLocalEmbedding:
         assert empty_result == []
 
 
+    @pytest.mark.skipif(
+        not SENTENCE_TRANSFORMERS_AVAILABLE,
+        reason="sentence-transformers not installed"
+    )
+    def test_local_cache_namespace_includes_backend(self) -> None:
+        """Test that torch and ONNX vectors are cached under different keys."""
+        torch_ns = LocalEmbedding(backend="torch")._cache_namespace
+        onnx_ns = LocalEmbedding(backend="onnx")._cache_namespace
+        assert torch_ns != onnx_ns
+        quantized = LocalEmbedding(backend="onnx", onnx_file="onnx/model_qint8_avx512_vnni.onnx")
+        custom_ns = quantized._cache_namespace
+        assert custom_ns != onnx_ns
+
+
 class TestOpenAIEmbedding:
     """Tests for OpenAIEmbedding provider (mocked)."""
 
@@ -279,9 +306,9 @@ class TestOpenAIEmbedding:
         
         mock_response = MagicMock()
         mock_response.status_code = 200
-        mock_response.json.return_value = {
-            "data": [{"embedding": [0.1] * 1536, "index": 0}]
-        }
+        mock_response.content = json.dumps(
+            {"data": [{"embedding": [0.1] * 1536, "index": 0}]}
+        ).encode()
         mock_response.raise_for_status = MagicMock()
 
         with patch.object(provider, "_get_client") as mock_get_client:
@@ -295,6 +322,75 @@ class TestOpenAIEmbedding:
             mock_client.post.assert_called_once()
 
 
+    @pytest.mark.asyncio
+    async def test_openai_embed_batch_splits_and_keeps_order(self) -> None:
+        """Test that large batches are split into requests and reassembled in order."""
+        provider = OpenAIEmbedding("test-key")
+        sizes: list[int] = []
+
+        async def fake_request(payload: dict) -> dict:
+            sizes.append(len(payload["input"]))
+            return {
+                "data": [
+                    {"index": i, "embedding": [float(text)]}
+                    for i, text in enumerate(payload["input"])
+                ]
+            }
+
+        with patch.object(provider, "_request_with_retry", side_effect=fake_request):
+            embeddings = await provider.embed_batch(
+                [str(i) for i in range(5)], batch_size=2, max_in_flight=2
+            )
+
+        assert embeddings == [[0.0], [1.0], [2.0], [3.0], [4.0]]
+        assert sorted(sizes) == [1, 2, 2]
+
+    @pytest.mark.asyncio
+    async def test_openai_embed_batch_cancels_pending_on_failure(self) -> None:
+        """Test that a failed batch cancels the requests still in flight."""
+        provider = OpenAIEmbedding("test-key")
+        cancelled: list[str] = []
+
+        async def fake_request(payload: dict) -> dict:
+            if payload["input"] == ["0"]:
+                raise httpx.ConnectError("boom")
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.extend(payload["input"])
+                raise
+            return {"data": []}
+
+        with patch.object(provider, "_request_with_retry", side_effect=fake_request):
+            with pytest.raises(httpx.ConnectError):
+                await provider.embed_batch(["0", "1", "2"], batch_size=1, max_in_flight=3)
+
+        assert sorted(cancelled) == ["1", "2"]
+
+    @pytest.mark.asyncio
+    async def test_openai_embed_batch_uses_cache(self) -> None:
+        """Test that cached and duplicate texts are not sent to the API again."""
+        provider = OpenAIEmbedding("test-key", cache=EmbeddingCache(maxsize=2))
+        inputs: list[list[str]] = []
+
+        async def fake_request(payload: dict) -> dict:
+            inputs.append(list(payload["input"]))
+            return {
+                "data": [
+                    {"index": i, "embedding": [float(text)]}
+                    for i, text in enumerate(payload["input"])
+                ]
+            }
+
+        with patch.object(provider, "_request_with_retry", side_effect=fake_request):
+            assert await provider.embed_batch(["1", "2", "1"]) == [[1.0], [2.0], [1.0]]
+            assert await provider.embed_batch(["2", "3"]) == [[2.0], [3.0]]
+            # "1" was evicted by the LRU once "3" was added
+            assert await provider.embed_batch(["1"]) == [[1.0]]
+
+        assert inputs == [["1", "2"], ["3"], ["1"]]
+
+
 class TestGeminiEmbedding:
     """Tests for GeminiEmbedding provider (mocked)."""
 
@@ -314,9 +410,7 @@ class TestGeminiEmbedding:
         
         mock_response = MagicMock()
         mock_response.status_code = 200
-        mock_response.json.return_value = {
-            "embedding": {"values": [0.1] * 768}
-        }
+        mock_response.content = json.dumps({"embedding": {"values": [0.1] * 768}}).encode()
         mock_response.raise_for_status = MagicMock()
 
         with patch.object(provider, "_get_client") as mock_get_client:
@@ -336,30 +430,47 @@ class TestOllamaEmbedding:
     async def test_ollama_embedding_available_check(self) -> None:
         """Test Ollama availability check with mocked server."""
         # Test when server is available
-        with patch("httpx.AsyncClient") as MockClient:
-            mock_client = AsyncMock()
-            mock_response = MagicMock()
-            mock_response.status_code = 200
-            mock_client.__aenter__.return_value = mock_client
-            mock_client.__aexit__.return_value = None
-            mock_client.get.return_value = mock_response
-            MockClient.return_value = mock_client
-            
+        mock_client = AsyncMock()
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_client.get.return_value = mock_response
+        with patch.object(OllamaEmbedding, "_shared_client", return_value=mock_client):
             result = await OllamaEmbedding.is_available("http://localhost:11434")
             assert result is True
 
         # Test when server is unavailable (connection error)
-        with patch("httpx.AsyncClient") as MockClient:
-            mock_client = AsyncMock()
-            import httpx
-            mock_client.__aenter__.return_value = mock_client
-            mock_client.__aexit__.return_value = None
-            mock_client.get.side_effect = httpx.RequestError("Connection failed")
-            MockClient.return_value = mock_client
-            
+        import httpx
+        mock_client = AsyncMock()
+        mock_client.get.side_effect = httpx.RequestError("Connection failed")
+        with patch.object(OllamaEmbedding, "_shared_client", return_value=mock_client):
             result = await OllamaEmbedding.is_available("http://localhost:11434")
             assert result is False
 
+    @pytest.mark.asyncio
+    async def test_ollama_shared_client_reused(self) -> None:
+        """Test that instances share one pooled client until aclose()."""
+        first = OllamaEmbedding._shared_client()
+        assert OllamaEmbedding._shared_client() is first
+
+        await OllamaEmbedding.aclose()
+        assert first.is_closed
+        assert OllamaEmbedding._shared_client() is not first
+        await OllamaEmbedding.aclose()
+
+    def test_ollama_client_per_event_loop(self) -> None:
+        """Test that sequential asyncio.run calls each get and release their own pool."""
+        provider = OllamaEmbedding()
+
+        async def use_and_close() -> httpx.AsyncClient:
+            client = OllamaEmbedding._shared_client()
+            await provider.close()
+            return client
+
+        first = asyncio.run(use_and_close())
+        second = asyncio.run(use_and_close())
+        assert first is not second
+        assert first.is_closed and second.is_closed
+
 
 class TestGetEmbeddingProvider:
     """Tests for get_embedding_provider factory function."""
@@ -409,14 +520,102 @@ class TestGetEmbeddingProvider:
             await get_embedding_provider({"provider": "unknown_provider"})
 
 
+class _FakeRedisPipeline:
+    def __init__(self, redis: "_FakeRedis") -> None:
+        self._redis = redis
+        self._ops: list[tuple[bytes, bytes, int | None]] = []
+
+    def set(self, key: bytes, value: bytes, ex: int | None = None) -> None:
+        self._ops.append((key, value, ex))
+
+    async def execute(self) -> None:
+        for key, value, ex in self._ops:
+            self._redis.data[key] = value
+            self._redis.ttls[key] = ex
+        self._redis.round_trips += 1
+
+
+class _FakeRedis:
+    """Minimal stand-in for the redis.asyncio client calls the cache makes."""
+
+    def __init__(self) -> None:
+        self.data: dict[bytes, bytes] = {}
+        self.ttls: dict[bytes, int | None] = {}
+        self.round_trips = 0
+
+    async def mget(self, keys: list[bytes]) -> list[bytes | None]:
+        self.round_trips += 1
+        return [self.data.get(key) for key in keys]
+
+    def pipeline(self, transaction: bool = True) -> _FakeRedisPipeline:
+        return _FakeRedisPipeline(self)
+
+    async def scan_iter(self, match: bytes):
+        prefix = match.rstrip(b"*")
+        for key in list(self.data):
+            if key.startswith(prefix):
+                yield key
+
+    async def delete(self, *keys: bytes) -> None:
+        for key in keys:
+            self.data.pop(key, None)
+
+
+class TestRedisEmbeddingCache:
+    """Tests for RedisEmbeddingCache against a fake client."""
+
+    @pytest.mark.asyncio
+    async def test_round_trip_and_misses(self) -> None:
+        """Test that stored vectors come back as float32 and unknown keys miss."""
+        client = _FakeRedis()
+        cache = RedisEmbeddingCache(client=client, ttl=60)
+        hit, miss = embedding_cache_key("ns", "hit"), embedding_cache_key("ns", "miss")
+
+        await cache.set_many({hit: [0.5, -1.25, 3.0]})
+        assert client.round_trips == 1
+        assert set(client.ttls.values()) == {60}
+
+        results = await cache.get_many([hit, miss])
+        assert client.round_trips == 2
+        assert results[0] == pytest.approx([0.5, -1.25, 3.0])
+        assert results[1] is None
+        assert await cache.get_many([]) == []
+
+    @pytest.mark.asyncio
+    async def test_namespace_and_prefix_separation(self) -> None:
+        """Test that model namespaces and key prefixes don't share entries."""
+        client = _FakeRedis()
+        first = RedisEmbeddingCache(client=client, prefix="a:")
+        second = RedisEmbeddingCache(client=client, prefix="b:")
+        key = embedding_cache_key("model-a:384", "text")
+
+        assert key != embedding_cache_key("model-b:384", "text")
+        await first.set_many({key: [1.0, 2.0]})
+        assert (await second.get_many([key])) == [None]
+
+        await first.clear()
+        assert (await first.get_many([key])) == [None]
+
+        await second.set_many({key: [3.0]})
+        await first.clear()
+        assert (await second.get_many([key]))[0] == pytest.approx([3.0])
+
+
 # =============================================================================
 # VectorIndex Tests
 # =============================================================================
 
 
+@pytest.fixture
+def mem_index() -> VectorIndex:
+    """4-dimensional VectorIndex backed by an in-memory SQLite database."""
+    return VectorIndex(connection=sqlite3.connect(":memory:"), dimension=4)
+
+
 class TestVectorIndex:
     """Tests for VectorIndex class."""
 
+    @pytest.mark.xdist_group("sqlite_fs")
     def test_index_init_creates_db(self, tmp_path: Path) -> None:
         """Test that VectorIndex creates database file and tables."""
         db_path = tmp_path / "vectors" / "index.db"
@@ -428,10 +627,14 @@ class TestVectorIndex:
         assert index.dimension == 384
         assert index.db_path == db_path
 
-    def test_add_and_search_chunk(self, tmp_path: Path) -> None:
+    def test_index_requires_path_or_connection(self) -> None:
+        """Test that exactly one of db_path and connection must be given."""
+        with pytest.raises(ValueError, match="exactly one"):
+            VectorIndex(dimension=4)
+
+    def test_add_and_search_chunk(self, mem_index: VectorIndex) -> None:
         """Test adding chunks and searching."""
-        db_path = tmp_path / "index.db"
-        index = VectorIndex(db_path, dimension=4)
+        index = mem_index
 
         # Add some test chunks with simple embeddings
         chunk_id1 = index.add_chunk(
@@ -469,10 +672,172 @@ class TestVectorIndex:
         assert results[0].text == "Python programming tutorial"
         assert results[0].score > 0.8  # High similarity
 
-    def test_hybrid_search(self, tmp_path: Path) -> None:
-        """Test hybrid search combining vector and BM25."""
+    def test_search_reflects_changes_after_cached_search(self, mem_index: VectorIndex) -> None:
+        """Test that adds and deletes are visible to searches after the first one."""
+        index = mem_index
+
+        index.add_chunk("a.md", "First", [1.0, 0.0, 0.0, 0.0], 1, 2)
+        assert [r.file_path for r in index.search([1.0, 0.0, 0.0, 0.0])] == ["a.md"]
+
+        index.add_chunk("b.md", "Second", [0.0, 1.0, 0.0, 0.0], 1, 2)
+        results = index.search([0.0, 1.0, 0.0, 0.0], limit=1)
+        assert results[0].file_path == "b.md"
+
+        index.delete_by_file("b.md")
+        assert [r.file_path for r in index.search([0.0, 1.0, 0.0, 0.0])] == ["a.md"]
+
+    @pytest.mark.skipif(not NUMPY_AVAILABLE, reason="numpy not installed")
+    @pytest.mark.xdist_group("sqlite_fs")
+    def test_vec_sidecar_survives_reopen_and_vacuum(self, tmp_path: Path) -> None:
+        """Test that the memory-mapped matrix file stays in sync with SQLite."""
+        db_path = tmp_path / "index.db"
+        index = VectorIndex(db_path, dimension=4)
+        index.add_chunk("keep.md", "Keep", [1.0, 0.0, 0.0, 0.0], 1, 2)
+        index.add_chunk("drop.md", "Drop", [0.0, 1.0, 0.0, 0.0], 1, 2)
+        assert len(index.search([1.0, 0.0, 0.0, 0.0], limit=5)) == 2
+
+        vec_path = db_path.with_suffix(".vec")
+        assert vec_path.exists()
+        index.add_chunk("new.md", "New", [0.0, 0.0, 1.0, 0.0], 1, 2)
+        index.delete_by_file("drop.md")
+
+        reopened = VectorIndex(db_path, dimension=4)
+        results = reopened.search([0.0, 0.0, 1.0, 0.0], limit=5)
+        assert [r.file_path for r in results] == ["new.md", "keep.md"]
+        assert results[0].score == pytest.approx(1.0)
+
+        size_before = vec_path.stat().st_size
+        reopened.vacuum()
+        assert vec_path.stat().st_size == size_before - 4 * 4
+        assert [r.file_path for r in reopened.search([1.0, 0.0, 0.0, 0.0], limit=5)] == [
+            "keep.md",
+            "new.md",
+        ]
+
+    @pytest.mark.skipif(not NUMPY_AVAILABLE, reason="numpy not installed")
+    @pytest.mark.xdist_group("sqlite_fs")
+    def test_vec_sidecar_bounded_under_reindexing(self, tmp_path: Path) -> None:
+        """Test that re-indexing a file compacts dead rows out of the sidecar."""
+        db_path = tmp_path / "index.db"
+        index = VectorIndex(db_path, dimension=4)
+        chunks = [
+            {"file_path": "doc.md", "text": f"Chunk {i}", "embedding": [1.0, float(i), 0.0, 0.0]}
+            for i in range(10)
+        ]
+        index.add_chunks(chunks)
+        index.search([1.0, 0.0, 0.0, 0.0], limit=1)
+
+        vec_path = db_path.with_suffix(".vec")
+        row_size = 4 * 4
+        for _ in range(20):
+            index.delete_by_file("doc.md")
+            index.add_chunks(chunks)
+            rows = (vec_path.stat().st_size - 16) // row_size
+            assert rows <= 2 * len(chunks)
+
+        results = index.search([1.0, 0.0, 0.0, 0.0], limit=20)
+        assert len(results) == len(chunks)
+
+    @pytest.mark.skipif(not NUMPY_AVAILABLE, reason="numpy not installed")
+    @pytest.mark.xdist_group("sqlite_fs")
+    def test_vec_sidecar_mixed_quantize_instances(self, tmp_path: Path) -> None:
+        """Test that appends never mix row layouts in a shared sidecar."""
+        db_path = tmp_path / "index.db"
+        plain = VectorIndex(db_path, dimension=8)
+        quantized = VectorIndex(db_path, dimension=8, quantize=True)
+
+        def unit(i: int) -> list[float]:
+            return [1.0 if j == i else 0.0 for j in range(8)]
+
+        for i in range(6):
+            plain.add_chunk(f"a{i}.md", f"A{i}", unit(i), 1, 2)
+        quantized.search(unit(0), limit=1)
+
+        plain.add_chunk("a6.md", "A6", unit(6), 1, 2)
+        assert quantized.search(unit(6), limit=1)[0].file_path == "a6.md"
+        fresh = VectorIndex(db_path, dimension=8, quantize=True)
+        assert fresh.search(unit(6), limit=1)[0].file_path == "a6.md"
+
+    @pytest.mark.xdist_group("sqlite_fs")
+    def test_search_sees_writes_from_other_instances(self, tmp_path: Path) -> None:
+        """Test that a cached matrix is reloaded after another instance writes."""
+        db_path = tmp_path / "index.db"
+        reader = VectorIndex(db_path, dimension=4)
+        writer = VectorIndex(db_path, dimension=4)
+        reader.add_chunk("a.md", "A", [1.0, 0.0, 0.0, 0.0], 1, 2)
+        assert [r.file_path for r in reader.search([1.0, 0.0, 0.0, 0.0], limit=5)] == ["a.md"]
+
+        writer.add_chunk("b.md", "B", [0.0, 1.0, 0.0, 0.0], 1, 2)
+        results = reader.search([0.0, 1.0, 0.0, 0.0], limit=5)
+        assert [r.file_path for r in results] == ["b.md", "a.md"]
+
+        writer.delete_by_file("b.md")
+        writer.add_chunk("c.md", "C", [0.0, 0.0, 1.0, 0.0], 1, 2)
+        results = reader.search([0.0, 0.0, 1.0, 0.0], limit=5)
+        assert [r.file_path for r in results] == ["c.md", "a.md"]
+
+        writer.delete_by_file("c.md")
+        assert [r.file_path for r in reader.search([1.0, 0.0, 0.0, 0.0], limit=5)] == ["a.md"]
+
+    def test_embeddings_stored_unit_length(self, mem_index: VectorIndex) -> None:
+        """Test that stored embeddings are normalized and scores stay cosine."""
+        index = mem_index
+        index.add_chunk("doc.md", "Scaled", [3.0, 4.0, 0.0, 0.0], 1, 2)
+
+        with index._connection() as conn:
+            row = conn.execute("SELECT embedding, norm FROM chunks").fetchone()
+        assert list(index._deserialize_embedding(row["embedding"])) == pytest.approx(
+            [0.6, 0.8, 0.0, 0.0]
+        )
+        assert row["norm"] == pytest.approx(5.0)
+
+        results = index.search([6.0, 8.0, 0.0, 0.0], limit=1)
+        assert results[0].score == pytest.approx(1.0)
+
+    @pytest.mark.xdist_group("sqlite_fs")
+    def test_legacy_embeddings_normalized_on_open(self, tmp_path: Path) -> None:
+        """Test that databases from before unit-length storage are migrated."""
         db_path = tmp_path / "index.db"
         index = VectorIndex(db_path, dimension=4)
+        index.add_chunk("doc.md", "Legacy", [1.0, 0.0, 0.0, 0.0], 1, 2)
+        with index._connection() as conn:
+            conn.execute(
+                "UPDATE chunks SET embedding = ?, norm = NULL",
+                (struct.pack("<4f", 0.0, 2.0, 0.0, 0.0),),
+            )
+            conn.execute("PRAGMA user_version = 0")
+
+        reopened = VectorIndex(db_path, dimension=4)
+        with reopened._connection() as conn:
+            row = conn.execute("SELECT embedding, norm FROM chunks").fetchone()
+            assert conn.execute("PRAGMA user_version").fetchone()[0] >= 1
+        assert list(reopened._deserialize_embedding(row["embedding"])) == pytest.approx(
+            [0.0, 1.0, 0.0, 0.0]
+        )
+        assert row["norm"] == pytest.approx(2.0)
+        assert reopened.search([0.0, 1.0, 0.0, 0.0], limit=1)[0].score == pytest.approx(1.0)
+
+    def test_add_chunks_batch(self, mem_index: VectorIndex) -> None:
+        """Test inserting many chunks in one call."""
+        index = mem_index
+
+        inserted = index.add_chunks([
+            {"file": "a.md", "text": "Alpha", "embedding": [1.0, 0.0, 0.0, 0.0],
+             "start_line": 1, "end_line": 2},
+            {"file_path": "b.md", "text": "Beta", "embedding": [0.0, 1.0, 0.0, 0.0]},
+        ])
+
+        assert inserted == 2
+        assert index.get_indexed_files() == ["a.md", "b.md"]
+        assert index.search([0.0, 1.0, 0.0, 0.0], limit=1)[0].text == "Beta"
+
+        with pytest.raises(ValueError, match="Embedding dimension"):
+            index.add_chunks([{"file": "c.md", "text": "Bad", "embedding": [1.0]}])
+        assert index.get_chunk_count() == 2
+
+    def test_hybrid_search(self, mem_index: VectorIndex) -> None:
+        """Test hybrid search combining vector and BM25."""
+        index = mem_index
 
         # Add test chunks
         index.add_chunk(
@@ -510,10 +875,26 @@ class TestVectorIndex:
         python_results = [r for r in results if "Python" in r.text]
         assert len(python_results) >= 1
 
-    def test_hybrid_search_invalid_weight(self, tmp_path: Path) -> None:
+    def test_hybrid_search_keeps_vector_only_matches(self, mem_index: VectorIndex) -> None:
+        """Test that chunks without keyword matches still rank on vector similarity."""
+        index = mem_index
+        index.add_chunk("semantic.md", "Snakes and scripting", [1.0, 0.0, 0.0, 0.0], 1, 2)
+        index.add_chunk("keyword.md", "Python trivia", [0.0, 1.0, 0.0, 0.0], 1, 2)
+
+        results = index.hybrid_search(
+            query_embedding=[1.0, 0.0, 0.0, 0.0],
+            query_text="Python",
+            limit=2,
+            vector_weight=0.7,
+        )
+
+        assert [r.file_path for r in results] == ["semantic.md", "keyword.md"]
+        assert results[0].score == pytest.approx(0.7)
+        assert results[1].score == pytest.approx(0.3)
+
+    def test_hybrid_search_invalid_weight(self, mem_index: VectorIndex) -> None:
         """Test that hybrid_search validates vector_weight."""
-        db_path = tmp_path / "index.db"
-        index = VectorIndex(db_path, dimension=4)
+        index = mem_index
 
         with pytest.raises(ValueError, match="vector_weight must be between 0 and 1"):
             index.hybrid_search([1.0, 0.0, 0.0, 0.0], "test", vector_weight=1.5)
@@ -521,10 +902,9 @@ class TestVectorIndex:
         with pytest.raises(ValueError, match="vector_weight must be between 0 and 1"):
             index.hybrid_search([1.0, 0.0, 0.0, 0.0], "test", vector_weight=-0.1)
 
-    def test_delete_by_file(self, tmp_path: Path) -> None:
+    def test_delete_by_file(self, mem_index: VectorIndex) -> None:
         """Test deleting chunks by file path."""
-        db_path = tmp_path / "index.db"
-        index = VectorIndex(db_path, dimension=4)
+        index = mem_index
 
         # Add chunks from multiple files
         index.add_chunk("file1.md", "Content 1", [1.0, 0.0, 0.0, 0.0], 1, 5)
@@ -543,10 +923,9 @@ class TestVectorIndex:
         files = index.get_indexed_files()
         assert files == ["file2.md"]
 
-    def test_get_indexed_files(self, tmp_path: Path) -> None:
+    def test_get_indexed_files(self, mem_index: VectorIndex) -> None:
         """Test getting list of indexed files."""
-        db_path = tmp_path / "index.db"
-        index = VectorIndex(db_path, dimension=4)
+        index = mem_index
 
         # Initially empty
         assert index.get_indexed_files() == []
@@ -563,15 +942,14 @@ class TestVectorIndex:
         assert "docs/tutorial.md" in files
         assert "readme.md" in files
 
-    def test_clear(self, tmp_path: Path) -> None:
+    def test_clear(self, mem_index: VectorIndex) -> None:
         """Test clearing all data from the index.
 
         Note: Due to SQLite FTS5 external content table limitations, the clear()
         method may encounter issues. This test verifies the intended behavior
         when it works, and tests the workaround (delete by file) as fallback.
         """
-        db_path = tmp_path / "clear_test.db"
-        index = VectorIndex(db_path, dimension=4)
+        index = mem_index
 
         # Add some chunks
         index.add_chunk("file1.md", "Content 1", [1.0, 0.0, 0.0, 0.0], 1, 5)
@@ -603,10 +981,27 @@ class TestVectorIndex:
         assert result.end_line == 20
         assert result.score == 0.95
 
-    def test_dimension_mismatch_on_add(self, tmp_path: Path) -> None:
+        with pytest.raises(AttributeError):
+            result.score = 0.5  # type: ignore[misc]
+
+    @pytest.mark.skipif(not NUMPY_AVAILABLE, reason="numpy not installed")
+    def test_search_arrays_then_fetch(self, mem_index: VectorIndex) -> None:
+        """Test ID/score search without text, then fetching selected rows."""
+        index = mem_index
+        first = index.add_chunk("a.md", "A", [1.0, 0.0, 0.0, 0.0], 1, 2)
+        index.add_chunk("b.md", "B", [0.0, 1.0, 0.0, 0.0], 1, 2)
+        third = index.add_chunk("c.md", "C", [1.0, 1.0, 0.0, 0.0], 1, 2)
+
+        ids, scores = index.search_arrays([1.0, 0.0, 0.0, 0.0], limit=2)
+        assert ids.tolist() == [first, third]
+        assert scores.tolist() == pytest.approx([1.0, 0.5**0.5])
+
+        results = index.fetch_results(ids[:1], scores[:1])
+        assert [(r.file_path, r.text) for r in results] == [("a.md", "A")]
+
+    def test_dimension_mismatch_on_add(self, mem_index: VectorIndex) -> None:
         """Test that adding wrong dimension embedding raises error."""
-        db_path = tmp_path / "index.db"
-        index = VectorIndex(db_path, dimension=4)
+        index = mem_index
 
         with pytest.raises(ValueError, match="Embedding dimension"):
             index.add_chunk(
@@ -617,18 +1012,16 @@ class TestVectorIndex:
                 5,
             )
 
-    def test_dimension_mismatch_on_search(self, tmp_path: Path) -> None:
+    def test_dimension_mismatch_on_search(self, mem_index: VectorIndex) -> None:
         """Test that searching with wrong dimension raises error."""
-        db_path = tmp_path / "index.db"
-        index = VectorIndex(db_path, dimension=4)
+        index = mem_index
 
         with pytest.raises(ValueError, match="Query embedding dimension"):
             index.search([1.0, 0.0])  # Wrong dimension
 
-    def test_get_stats(self, tmp_path: Path) -> None:
+    def test_get_stats(self) -> None:
         """Test getting index statistics."""
-        db_path = tmp_path / "index.db"
-        index = VectorIndex(db_path, dimension=384)
+        index = VectorIndex(connection=sqlite3.connect(":memory:"), dimension=384)
 
         # Empty stats
         stats = index.get_stats()
@@ -646,10 +1039,9 @@ class TestVectorIndex:
         assert stats["total_chunks"] == 3
         assert stats["indexed_files"] == 2
 
-    def test_serialization_roundtrip(self, tmp_path: Path) -> None:
+    def test_serialization_roundtrip(self, mem_index: VectorIndex) -> None:
         """Test embedding serialization and deserialization."""
-        db_path = tmp_path / "index.db"
-        index = VectorIndex(db_path, dimension=4)
+        index = mem_index
 
         original = [0.1, 0.2, 0.3, 0.4]
         serialized = index._serialize_embedding(original)
@@ -659,10 +1051,27 @@ class TestVectorIndex:
         for a, b in zip(original, deserialized):
             assert abs(a - b) < 1e-6
 
-    def test_cosine_similarity(self, tmp_path: Path) -> None:
+    def test_quantized_index_roundtrip_and_search(self) -> None:
+        """Test int8 storage keeps values and ranking close to float32."""
+        index = VectorIndex(
+            connection=sqlite3.connect(":memory:"), dimension=4, quantize=True
+        )
+
+        original = [0.1, -0.2, 0.3, 0.4]
+        serialized = index._serialize_embedding(original)
+        assert len(serialized) == 4 + 4
+        for a, b in zip(original, index._deserialize_embedding(serialized)):
+            assert abs(a - b) < 0.01
+
+        index.add_chunk("doc1.md", "Exact", [1.0, 0.0, 0.0, 0.0], 1, 2)
+        index.add_chunk("doc2.md", "Other", [0.0, 1.0, 0.0, 0.0], 1, 2)
+        results = index.search([1.0, 0.0, 0.0, 0.0], limit=1)
+        assert results[0].file_path == "doc1.md"
+        assert abs(results[0].score - 1.0) < 1e-3
+
+    def test_cosine_similarity(self, mem_index: VectorIndex) -> None:
         """Test cosine similarity calculation."""
-        db_path = tmp_path / "index.db"
-        index = VectorIndex(db_path, dimension=4)
+        index = mem_index
 
         # Identical vectors = 1.0
         assert abs(index._cosine_similarity([1, 0, 0, 0], [1, 0, 0, 0]) - 1.0) < 1e-6
@@ -676,10 +1085,9 @@ class TestVectorIndex:
         # Zero vectors = 0.0
         assert index._cosine_similarity([0, 0, 0, 0], [1, 0, 0, 0]) == 0.0
 
-    def test_cosine_similarity_dimension_mismatch(self, tmp_path: Path) -> None:
+    def test_cosine_similarity_dimension_mismatch(self, mem_index: VectorIndex) -> None:
         """Test that cosine similarity raises error for mismatched dimensions."""
-        db_path = tmp_path / "index.db"
-        index = VectorIndex(db_path, dimension=4)
+        index = mem_index
 
         with pytest.raises(ValueError, match="Vector dimensions don't match"):
             index._cosine_similarity([1, 0, 0], [1, 0, 0, 0])
@@ -697,13 +1105,16 @@ class TestMemoryIntegration:
         not SENTENCE_TRANSFORMERS_AVAILABLE,
         reason="sentence-transformers not installed"
     )
+    @pytest.mark.xdist_group("sqlite_fs")
     @pytest.mark.asyncio
-    async def test_full_memory_pipeline(self, tmp_path: Path) -> None:
+    async def test_full_memory_pipeline(
+        self, tmp_path: Path, shared_local_embedder: LocalEmbedding
+    ) -> None:
         """Test complete flow: store → chunk → embed → index → search."""
         # Setup
         workspace = tmp_path / "workspace"
         store = MemoryStore(workspace)
-        embedding_provider = LocalEmbedding()
+        embedding_provider = shared_local_embedder
         index = VectorIndex(tmp_path / "vectors.db", dimension=384)
 
         # 1. Create memory content
@@ -715,15 +1126,10 @@ class TestMemoryIntegration:
         assert len(chunks) >= 1
 
         # 3. Embed and index
-        for chunk in chunks:
-            embedding = await embedding_provider.embed(chunk["text"])
-            index.add_chunk(
-                file_path=chunk["file"],
-                text=chunk["text"],
-                embedding=embedding,
-                start_line=chunk["start_line"],
-                end_line=chunk["end_line"],
-            )
+        embeddings = await embedding_provider.embed_batch([chunk["text"] for chunk in chunks])
+        for chunk, embedding in zip(chunks, embeddings):
+            chunk["embedding"] = embedding
+        assert index.add_chunks(chunks) == len(chunks)
 
         # 4. Search
         query = "Python programming"
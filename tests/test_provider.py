@@ -1,9 +1,11 @@
 import asyncio
 import os
+from types import SimpleNamespace
 
 import pytest
 
 from icron.providers.lazyllm_provider import LazyLLMProvider
+from icron.providers.openai_provider import OpenAIProvider
 
 
 SOURCE = "doubao"
@@ -112,3 +114,173 @@ class TestLazyLLMProvider:
         assert len(response.tool_calls) == 1
         assert response.tool_calls[0].name == "read_file"
         assert response.tool_calls[0].arguments == {"path": "README.md"}
+
+
+def _openai_tool_response(arguments):
+    tool_call = SimpleNamespace(
+        id="call_1",
+        function=SimpleNamespace(name="read_file", arguments=arguments),
+    )
+    message = SimpleNamespace(content=None, tool_calls=[tool_call])
+    return SimpleNamespace(
+        choices=[SimpleNamespace(message=message, finish_reason="tool_calls")],
+        usage=None,
+    )
+
+
+def _stream_chunk(content=None, tool_calls=None, finish_reason=None):
+    delta = SimpleNamespace(content=content, tool_calls=tool_calls)
+    return SimpleNamespace(choices=[SimpleNamespace(delta=delta, finish_reason=finish_reason)])
+
+
+def _tool_fragment(arguments, id=None, name=None):
+    function = SimpleNamespace(name=name, arguments=arguments)
+    return [SimpleNamespace(index=0, id=id, function=function)]
+
+
+class _FakeStream:
+    """Async-iterable stand-in for openai.AsyncStream that records close()."""
+
+    def __init__(self, chunks):
+        self._chunks = chunks
+        self.closed = False
+
+    async def __aiter__(self):
+        for chunk in self._chunks:
+            yield chunk
+
+    async def close(self):
+        self.closed = True
+
+
+def _install_stream(provider, stream):
+    requests = []
+
+    async def fake_create(**kwargs):
+        requests.append(kwargs)
+        return stream
+
+    provider._create = fake_create
+    return requests
+
+
+async def _collect(deltas):
+    return [delta async for delta in deltas]
+
+
+class TestOpenAIProvider:
+    def test_parse_response_decodes_tool_arguments(self):
+        provider = OpenAIProvider(api_key="test-key")
+
+        response = provider._parse_response(_openai_tool_response("{\"path\": \"README.md\"}"))
+
+        assert response.finish_reason == "tool_calls"
+        assert response.tool_calls[0].arguments == {"path": "README.md"}
+
+    def test_parse_response_keeps_invalid_arguments_raw(self):
+        provider = OpenAIProvider(api_key="test-key")
+
+        response = provider._parse_response(_openai_tool_response("{not json"))
+
+        assert response.tool_calls[0].arguments == {"raw": "{not json"}
+
+    @pytest.mark.parametrize(
+        ("raw", "expected"),
+        [
+            ("null", {}),
+            ("[1, 2]", {"value": [1, 2]}),
+            ('"text"', {"value": "text"}),
+            ("42", {"value": 42}),
+        ],
+    )
+    def test_parse_response_normalizes_non_object_arguments(self, raw, expected):
+        provider = OpenAIProvider(api_key="test-key")
+
+        response = provider._parse_response(_openai_tool_response(raw))
+
+        assert response.tool_calls[0].arguments == expected
+
+    def test_closing_one_client_keeps_shared_pool_open(self):
+        first = OpenAIProvider(api_key="test-key")
+        second = OpenAIProvider(api_key="test-key")
+        pool = first.client._client
+        assert second.client._client is pool
+
+        async def close_first():
+            await first.client.close()
+            async with second.client:
+                pass
+
+        asyncio.run(close_first())
+        assert not pool.is_closed
+
+        asyncio.run(OpenAIProvider.close_shared())
+        assert pool.is_closed
+        assert OpenAIProvider(api_key="test-key").client._client is not pool
+
+    def test_chat_stream_assembles_tool_call_fragments(self):
+        provider = OpenAIProvider(api_key="test-key")
+        stream = _FakeStream([
+            _stream_chunk(content="Reading"),
+            _stream_chunk(tool_calls=_tool_fragment("{\"path\": ", id="call_1", name="read_file")),
+            _stream_chunk(tool_calls=_tool_fragment("\"README.md\"}")),
+            _stream_chunk(finish_reason="tool_calls"),
+        ])
+        requests = _install_stream(provider, stream)
+
+        deltas = asyncio.run(_collect(provider.chat_stream(messages=[])))
+
+        assert requests[0]["stream"] is True
+        assert deltas[0].content == "Reading"
+        assert deltas[-1].finish_reason == "tool_calls"
+        assert deltas[-1].tool_calls[0].id == "call_1"
+        assert deltas[-1].tool_calls[0].arguments == {"path": "README.md"}
+        assert stream.closed
+
+    def test_chat_stream_reports_usage(self):
+        provider = OpenAIProvider(api_key="test-key")
+        usage = SimpleNamespace(prompt_tokens=12, completion_tokens=3, total_tokens=15)
+        stream = _FakeStream([
+            _stream_chunk(content="Hi"),
+            _stream_chunk(finish_reason="stop"),
+            SimpleNamespace(choices=[], usage=usage),
+        ])
+        requests = _install_stream(provider, stream)
+
+        deltas = asyncio.run(_collect(provider.chat_stream(messages=[])))
+
+        assert requests[0]["stream_options"] == {"include_usage": True}
+        assert deltas[-1].finish_reason == "stop"
+        assert deltas[-1].usage == {
+            "prompt_tokens": 12,
+            "completion_tokens": 3,
+            "total_tokens": 15,
+        }
+
+    def test_chat_stream_flushes_without_finish_reason(self):
+        provider = OpenAIProvider(api_key="test-key")
+        stream = _FakeStream([
+            _stream_chunk(content="Reading"),
+            _stream_chunk(tool_calls=_tool_fragment("{}", id="call_1", name="list_dir")),
+        ])
+        _install_stream(provider, stream)
+
+        deltas = asyncio.run(_collect(provider.chat_stream(messages=[])))
+
+        assert [d.content for d in deltas] == ["Reading", ""]
+        assert deltas[-1].finish_reason == "tool_calls"
+        assert deltas[-1].tool_calls[0].name == "list_dir"
+
+    def test_chat_stream_closed_on_early_exit(self):
+        provider = OpenAIProvider(api_key="test-key")
+        stream = _FakeStream([_stream_chunk(content="a"), _stream_chunk(content="b")])
+        _install_stream(provider, stream)
+
+        async def first_delta():
+            deltas = provider.chat_stream(messages=[])
+            delta = await deltas.__anext__()
+            await deltas.aclose()
+            return delta
+
+        assert asyncio.run(first_delta()).content == "a"
+        assert stream.closed
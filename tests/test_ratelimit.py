@@ -0,0 +1,64 @@
+import asyncio
+from time import monotonic
+
+import pytest
+
+from icron.providers.ratelimit import TokenBucket, parse_reset_duration
+
+
+class TestParseResetDuration:
+    @pytest.mark.parametrize(
+        "value, expected",
+        [
+            ("2", 2.0),
+            ("0.5", 0.5),
+            ("1s", 1.0),
+            ("6m0s", 360.0),
+            ("20ms", 0.02),
+            ("1h2m3s", 3723.0),
+        ],
+    )
+    def test_parses_durations(self, value, expected):
+        assert parse_reset_duration(value) == pytest.approx(expected)
+
+    def test_invalid_values_return_none(self):
+        assert parse_reset_duration(None) is None
+        assert parse_reset_duration("") is None
+        assert parse_reset_duration("soon") is None
+
+
+class TestTokenBucket:
+    def test_rejects_non_positive_rate(self):
+        with pytest.raises(ValueError):
+            TokenBucket(0)
+
+    @pytest.mark.asyncio
+    async def test_burst_then_throttle(self):
+        bucket = TokenBucket(rate=20, burst=2)
+
+        start = monotonic()
+        for _ in range(3):
+            await bucket.acquire()
+
+        # Two tokens are available immediately; the third waits ~1/20s
+        assert monotonic() - start >= 0.04
+
+    @pytest.mark.asyncio
+    async def test_penalize_blocks_until_retry_after(self):
+        bucket = TokenBucket(rate=100, burst=5)
+        bucket.penalize(0.05)
+
+        start = monotonic()
+        await bucket.acquire()
+
+        assert monotonic() - start >= 0.05
+
+    @pytest.mark.asyncio
+    async def test_update_caps_tokens_to_server_remaining(self):
+        bucket = TokenBucket(rate=1000, burst=10)
+        bucket.update(remaining=0, reset_after=0.05)
+
+        start = monotonic()
+        await asyncio.wait_for(bucket.acquire(), timeout=1)
+
+        assert monotonic() - start >= 0.05
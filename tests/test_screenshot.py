@@ -1,13 +1,15 @@
 """Unit tests for the screenshot tool."""
 
 import re
+import sys
+import types
 from pathlib import Path
 from typing import Any
-from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
 from icron.agent.tools.screenshot import (
+    ADA_AVAILABLE,
     ScreenshotTool,
     _generate_filename,
     _validate_url,
@@ -21,6 +23,8 @@ from icron.agent.tools.screenshot import (
 class TestValidateUrl:
     """Tests for _validate_url function."""
 
+    pytestmark = pytest.mark.fast
+
     @pytest.mark.parametrize("url", [
         "http://example.com",
         "https://example.com",
@@ -67,11 +71,23 @@ class TestValidateUrl:
         assert is_valid is False
         assert "domain" in error.lower()
 
+    @pytest.mark.parametrize("url", [" https://example.com", "https://example.com\n"])
+    def test_surrounding_whitespace_ignored(self, url: str) -> None:
+        """Leading/trailing whitespace should not fail validation."""
+        assert _validate_url(url) == (True, "")
+
     def test_empty_url_rejected(self) -> None:
         """Empty URL should be rejected."""
         is_valid, error = _validate_url("")
         assert is_valid is False
 
+    @pytest.mark.skipif(not ADA_AVAILABLE, reason="ada-url not installed")
+    def test_malformed_host_rejected(self) -> None:
+        """Hosts the WHATWG parser rejects should fail validation."""
+        is_valid, error = _validate_url("http://exa mple.com")
+        assert is_valid is False
+        assert "malformed" in error.lower()
+
 
 # =============================================================================
 # Filename Generation Tests
@@ -80,6 +96,8 @@ class TestValidateUrl:
 class TestGenerateFilename:
     """Tests for _generate_filename function."""
 
+    pytestmark = pytest.mark.fast
+
     def test_filename_format(self) -> None:
         """Filename should match expected format: screenshot_{timestamp}_{hash}.png."""
         filename = _generate_filename("https://example.com")
@@ -121,6 +139,8 @@ class TestGenerateFilename:
 class TestScreenshotToolInit:
     """Tests for ScreenshotTool initialization."""
 
+    pytestmark = pytest.mark.fast
+
     def test_default_workspace(self) -> None:
         """Default workspace should be current working directory."""
         tool = ScreenshotTool()
@@ -153,12 +173,22 @@ class TestScreenshotToolInit:
 # Tool Schema Tests
 # =============================================================================
 
+@pytest.fixture(scope="module")
+def tool() -> ScreenshotTool:
+    """Shared tool for tests that only read the schema or call pure validation methods."""
+    return ScreenshotTool()
+
+
+@pytest.fixture(scope="module")
+def workspace_tool(tmp_path_factory: pytest.TempPathFactory) -> ScreenshotTool:
+    """Shared tool with its own temporary workspace, for tests that don't inspect it."""
+    return ScreenshotTool(workspace_path=str(tmp_path_factory.mktemp("workspace")))
+
+
 class TestScreenshotToolSchema:
     """Tests for ScreenshotTool schema definition."""
 
-    @pytest.fixture
-    def tool(self) -> ScreenshotTool:
-        return ScreenshotTool()
+    pytestmark = pytest.mark.fast
 
     def test_tool_name(self, tool: ScreenshotTool) -> None:
         """Tool should have correct name."""
@@ -187,101 +217,158 @@ class TestScreenshotToolSchema:
 # Parameter Validation Tests
 # =============================================================================
 
+
 class TestScreenshotToolValidation:
     """Tests for ScreenshotTool parameter validation."""
 
-    @pytest.fixture
-    def tool(self) -> ScreenshotTool:
-        return ScreenshotTool()
+    pytestmark = pytest.mark.fast
 
     def test_missing_required_url(self, tool: ScreenshotTool) -> None:
         """Missing URL should produce validation error."""
-        errors = tool.validate_params({})
-        assert any("url" in e.lower() for e in errors)
+        assert ("url", "missing") in tool.param_errors({})
 
     def test_valid_params_no_errors(self, tool: ScreenshotTool) -> None:
         """Valid parameters should produce no errors."""
-        errors = tool.validate_params({
+        errors = tool.param_errors({
             "url": "https://example.com",
             "width": 1920,
             "height": 1080
         })
         assert errors == []
 
-    def test_width_below_minimum(self, tool: ScreenshotTool) -> None:
-        """Width below minimum should produce error."""
-        errors = tool.validate_params({
-            "url": "https://example.com",
-            "width": 100
-        })
-        assert any("width" in e.lower() and "320" in e for e in errors)
+    @pytest.mark.parametrize("params,expected", [
+        pytest.param({"width": 100}, ("width", "below_min"), id="width_below_minimum"),
+        pytest.param({"width": 5000}, ("width", "above_max"), id="width_above_maximum"),
+        pytest.param({"height": 100}, ("height", "below_min"), id="height_below_minimum"),
+        pytest.param({"height": 5000}, ("height", "above_max"), id="height_above_maximum"),
+        pytest.param({"width": "1920"}, ("width", "wrong_type"), id="width_wrong_type"),
+        pytest.param({"full_page": "true"}, ("full_page", "wrong_type"), id="full_page_wrong_type"),
+        pytest.param({"width": True}, ("width", "wrong_type"), id="width_bool"),
+    ])
+    def test_param_bounds_and_types(
+        self, tool: ScreenshotTool, params: dict[str, Any], expected: tuple[str, str]
+    ) -> None:
+        """Out-of-range or mistyped parameters should produce a matching error."""
+        assert expected in tool.param_errors({"url": "https://example.com", **params})
+
+    def test_validate_params_messages(self, tool: ScreenshotTool) -> None:
+        """validate_params should render structured errors as readable messages."""
+        errors = tool.validate_params({"width": 100, "height": 5000, "full_page": "true"})
+        assert errors == [
+            "missing required url",
+            "full_page should be boolean",
+            "width must be >= 320",
+            "height must be <= 2160",
+        ]
 
-    def test_width_above_maximum(self, tool: ScreenshotTool) -> None:
-        """Width above maximum should produce error."""
-        errors = tool.validate_params({
-            "url": "https://example.com",
-            "width": 5000
-        })
-        assert any("width" in e.lower() and "3840" in e for e in errors)
 
-    def test_height_below_minimum(self, tool: ScreenshotTool) -> None:
-        """Height below minimum should produce error."""
-        errors = tool.validate_params({
-            "url": "https://example.com",
-            "height": 100
-        })
-        assert any("height" in e.lower() and "240" in e for e in errors)
+# =============================================================================
+# Execute Method Tests
+# =============================================================================
 
-    def test_height_above_maximum(self, tool: ScreenshotTool) -> None:
-        """Height above maximum should produce error."""
-        errors = tool.validate_params({
-            "url": "https://example.com",
-            "height": 5000
-        })
-        assert any("height" in e.lower() and "2160" in e for e in errors)
+class _FakePage:
+    """Playwright page stub recording goto/screenshot calls."""
 
-    def test_width_wrong_type(self, tool: ScreenshotTool) -> None:
-        """Width as string should produce type error."""
-        errors = tool.validate_params({
-            "url": "https://example.com",
-            "width": "1920"
-        })
-        assert any("width" in e.lower() and "integer" in e.lower() for e in errors)
+    def __init__(self) -> None:
+        self.goto_calls: list[tuple[tuple, dict]] = []
+        self.screenshot_calls: list[tuple[tuple, dict]] = []
+        self.goto_error: Exception | None = None
 
-    def test_full_page_wrong_type(self, tool: ScreenshotTool) -> None:
-        """full_page as string should produce type error."""
-        errors = tool.validate_params({
-            "url": "https://example.com",
-            "full_page": "true"
-        })
-        assert any("full_page" in e.lower() and "boolean" in e.lower() for e in errors)
+    async def goto(self, *args: Any, **kwargs: Any) -> None:
+        self.goto_calls.append((args, kwargs))
+        if self.goto_error is not None:
+            raise self.goto_error
 
+    async def screenshot(self, *args: Any, **kwargs: Any) -> None:
+        self.screenshot_calls.append((args, kwargs))
 
-# =============================================================================
-# Execute Method Tests
-# =============================================================================
 
-def _create_playwright_mocks() -> tuple[AsyncMock, AsyncMock, AsyncMock, MagicMock]:
-    """Create standard Playwright mock objects."""
-    mock_page = AsyncMock()
-    mock_context = AsyncMock()
-    mock_context.new_page = AsyncMock(return_value=mock_page)
-    mock_context.close = AsyncMock()
-    
-    mock_browser = AsyncMock()
-    mock_browser.new_context = AsyncMock(return_value=mock_context)
-    mock_browser.close = AsyncMock()
-    
-    mock_playwright_instance = AsyncMock()
-    mock_playwright_instance.chromium.launch = AsyncMock(return_value=mock_browser)
-    
-    mock_async_playwright_cm = MagicMock()
-    mock_async_playwright_cm.__aenter__ = AsyncMock(return_value=mock_playwright_instance)
-    mock_async_playwright_cm.__aexit__ = AsyncMock(return_value=None)
-    
-    return mock_page, mock_browser, mock_playwright_instance, mock_async_playwright_cm
+class _FakeContext:
+    """Browser context stub handing out a single page."""
+
+    def __init__(self, page: _FakePage) -> None:
+        self.page = page
+        self.closed = False
+
+    async def new_page(self) -> _FakePage:
+        return self.page
+
+    async def close(self) -> None:
+        self.closed = True
+
+
+class _FakeBrowser:
+    """Browser stub recording new_context calls."""
+
+    def __init__(self, context: _FakeContext) -> None:
+        self.context = context
+        self.new_context_calls: list[tuple[tuple, dict]] = []
+        self.closed = False
+
+    async def new_context(self, *args: Any, **kwargs: Any) -> _FakeContext:
+        self.new_context_calls.append((args, kwargs))
+        return self.context
+
+    async def close(self) -> None:
+        self.closed = True
+
+
+class _FakeChromium:
+    def __init__(self) -> None:
+        self.browser: _FakeBrowser | None = None
+
+    async def launch(self, **kwargs: Any) -> _FakeBrowser | None:
+        return self.browser
 
 
+class _FakePlaywright:
+    """Stands in for both async_playwright() and the Playwright instance it yields."""
+
+    def __init__(self) -> None:
+        self.chromium = _FakeChromium()
+
+    async def __aenter__(self) -> "_FakePlaywright":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        return None
+
+
+PlaywrightMocks = tuple[_FakePage, _FakeBrowser, _FakePlaywright]
+
+# Built once; patched_playwright points its attributes at each test's fakes
+_FAKE_PW = types.ModuleType("playwright.async_api")
+
+
+@pytest.fixture(scope="session")
+def playwright_cm() -> _FakePlaywright:
+    """Context manager shared across tests; pw_mocks wires in a fresh browser."""
+    return _FakePlaywright()
+
+
+@pytest.fixture
+def pw_mocks(playwright_cm: _FakePlaywright) -> PlaywrightMocks:
+    """Fresh page and browser for one test, wired into the shared context manager."""
+    page = _FakePage()
+    browser = _FakeBrowser(_FakeContext(page))
+    playwright_cm.chromium.browser = browser
+    return page, browser, playwright_cm
+
+
+@pytest.fixture
+def patched_playwright(
+    pw_mocks: PlaywrightMocks, monkeypatch: pytest.MonkeyPatch
+) -> PlaywrightMocks:
+    """Install the shared fake playwright.async_api module backed by pw_mocks."""
+    playwright = pw_mocks[2]
+    monkeypatch.setattr(_FAKE_PW, "async_playwright", lambda: playwright, raising=False)
+    monkeypatch.setattr(_FAKE_PW, "TimeoutError", TimeoutError, raising=False)
+    monkeypatch.setitem(sys.modules, "playwright.async_api", _FAKE_PW)
+    return pw_mocks
+
+
+@pytest.mark.mock_heavy
+@pytest.mark.xdist_group("playwright")
 class TestScreenshotToolExecute:
     """Tests for ScreenshotTool.execute method with mocked Playwright."""
 
@@ -290,112 +377,98 @@ class TestScreenshotToolExecute:
         """Create tool with temporary workspace."""
         return ScreenshotTool(workspace_path=str(tmp_path))
 
-    @pytest.mark.asyncio
     async def test_invalid_url_returns_error(self, tool: ScreenshotTool) -> None:
         """Invalid URL should return error without calling Playwright."""
         result = await tool.execute(url="ftp://invalid.com")
         assert "Error" in result
         assert "validation failed" in result.lower()
 
-    @pytest.mark.asyncio
     async def test_missing_domain_returns_error(self, tool: ScreenshotTool) -> None:
         """URL without domain should return error."""
         result = await tool.execute(url="http://")
         assert "Error" in result
         assert "domain" in result.lower()
 
-    @pytest.mark.asyncio
-    async def test_playwright_import_error(self, tool: ScreenshotTool) -> None:
+    async def test_url_whitespace_stripped_before_navigation(
+        self, tool: ScreenshotTool, patched_playwright: PlaywrightMocks
+    ) -> None:
+        """The browser should be sent the trimmed URL."""
+        page, _, _ = patched_playwright
+
+        result = await tool.execute(url="  https://example.com ")
+
+        assert "Screenshot captured successfully" in result
+        assert page.goto_calls[0][0][0] == "https://example.com"
+
+    async def test_repeated_url_reuses_cached_validation(
+        self, tool: ScreenshotTool, patched_playwright: PlaywrightMocks
+    ) -> None:
+        """Repeated captures of one URL should hit the _validate_url cache."""
+        await tool.execute(url="https://cache-check.example.com")
+        hits = _validate_url.cache_info().hits
+
+        await tool.execute(url="https://cache-check.example.com")
+        assert _validate_url.cache_info().hits == hits + 1
+
+    async def test_playwright_import_error(
+        self, tool: ScreenshotTool, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
         """Should return helpful error when Playwright import fails."""
-        import sys
-        
-        # Save original modules
-        original_playwright = sys.modules.get("playwright")
-        original_async_api = sys.modules.get("playwright.async_api")
-        
-        # Remove playwright from modules to force ImportError
-        sys.modules["playwright"] = None  # type: ignore
-        sys.modules["playwright.async_api"] = None  # type: ignore
-        
-        try:
-            result = await tool.execute(url="https://example.com")
-            # The tool handles ImportError gracefully
-            assert "Error" in result or "Playwright" in result or "screenshot" in result.lower()
-        finally:
-            # Restore original modules
-            if original_playwright is not None:
-                sys.modules["playwright"] = original_playwright
-            if original_async_api is not None:
-                sys.modules["playwright.async_api"] = original_async_api
-
-    @pytest.mark.asyncio
-    async def test_creates_screenshots_directory(self, tool: ScreenshotTool, tmp_path: Path) -> None:
+        # A None entry in sys.modules makes the import raise ImportError
+        monkeypatch.setitem(sys.modules, "playwright", None)
+        monkeypatch.setitem(sys.modules, "playwright.async_api", None)
+
+        result = await tool.execute(url="https://example.com")
+        assert "Error" in result
+        assert "Playwright not installed" in result
+
+    async def test_creates_screenshots_directory(
+        self, tool: ScreenshotTool, tmp_path: Path, patched_playwright: PlaywrightMocks
+    ) -> None:
         """Should create media/screenshots directory."""
-        mock_page, mock_browser, _, mock_async_playwright_cm = _create_playwright_mocks()
-        
-        # Create mock module with async_playwright function
-        mock_playwright_module = MagicMock()
-        mock_playwright_module.async_playwright = MagicMock(return_value=mock_async_playwright_cm)
-        mock_playwright_module.TimeoutError = TimeoutError
-        
-        with patch.dict("sys.modules", {"playwright.async_api": mock_playwright_module}):
-            await tool.execute(url="https://example.com")
+        await tool.execute(url="https://example.com")
         
         screenshots_dir = tmp_path / "media" / "screenshots"
         assert screenshots_dir.exists()
 
-    @pytest.mark.asyncio
-    async def test_successful_screenshot_returns_info(self, tool: ScreenshotTool, tmp_path: Path) -> None:
+    async def test_successful_screenshot_returns_info(
+        self, tool: ScreenshotTool, patched_playwright: PlaywrightMocks
+    ) -> None:
         """Successful screenshot should return path and metadata."""
-        mock_page, mock_browser, _, mock_async_playwright_cm = _create_playwright_mocks()
-        
-        mock_playwright_module = MagicMock()
-        mock_playwright_module.async_playwright = MagicMock(return_value=mock_async_playwright_cm)
-        mock_playwright_module.TimeoutError = TimeoutError
-        
-        with patch.dict("sys.modules", {"playwright.async_api": mock_playwright_module}):
-            result = await tool.execute(
-                url="https://example.com",
-                width=1920,
-                height=1080,
-                full_page=True
-            )
+        result = await tool.execute(
+            url="https://example.com",
+            width=1920,
+            height=1080,
+            full_page=True
+        )
         
         assert "Screenshot captured successfully" in result
         assert "https://example.com" in result
         assert "1920x1080" in result
         assert "True" in result  # full_page
 
-    @pytest.mark.asyncio
-    async def test_browser_called_with_correct_viewport(self, tool: ScreenshotTool) -> None:
+    async def test_browser_called_with_correct_viewport(
+        self, tool: ScreenshotTool, patched_playwright: PlaywrightMocks
+    ) -> None:
         """Browser should be configured with requested viewport."""
-        mock_page, mock_browser, _, mock_async_playwright_cm = _create_playwright_mocks()
+        _, browser, _ = patched_playwright
         
-        mock_playwright_module = MagicMock()
-        mock_playwright_module.async_playwright = MagicMock(return_value=mock_async_playwright_cm)
-        mock_playwright_module.TimeoutError = TimeoutError
-        
-        with patch.dict("sys.modules", {"playwright.async_api": mock_playwright_module}):
-            await tool.execute(url="https://example.com", width=800, height=600)
+        await tool.execute(url="https://example.com", width=800, height=600)
         
         # Check viewport was set correctly
-        call_kwargs = mock_browser.new_context.call_args[1]
+        call_kwargs = browser.new_context_calls[-1][1]
         assert call_kwargs["viewport"] == {"width": 800, "height": 600}
 
-    @pytest.mark.asyncio
-    async def test_full_page_screenshot_option(self, tool: ScreenshotTool) -> None:
+    async def test_full_page_screenshot_option(
+        self, tool: ScreenshotTool, patched_playwright: PlaywrightMocks
+    ) -> None:
         """full_page option should be passed to screenshot."""
-        mock_page, mock_browser, _, mock_async_playwright_cm = _create_playwright_mocks()
-        
-        mock_playwright_module = MagicMock()
-        mock_playwright_module.async_playwright = MagicMock(return_value=mock_async_playwright_cm)
-        mock_playwright_module.TimeoutError = TimeoutError
+        page, _, _ = patched_playwright
         
-        with patch.dict("sys.modules", {"playwright.async_api": mock_playwright_module}):
-            await tool.execute(url="https://example.com", full_page=True)
+        await tool.execute(url="https://example.com", full_page=True)
         
         # Check full_page was passed to screenshot
-        call_kwargs = mock_page.screenshot.call_args[1]
+        call_kwargs = page.screenshot_calls[-1][1]
         assert call_kwargs["full_page"] is True
 
 
@@ -406,43 +479,43 @@ class TestScreenshotToolExecute:
 class TestScreenshotToolEdgeCases:
     """Tests for edge cases and error handling."""
 
-    @pytest.fixture
-    def tool(self, tmp_path: Path) -> ScreenshotTool:
-        return ScreenshotTool(workspace_path=str(tmp_path))
-
-    @pytest.mark.asyncio
-    async def test_timeout_error_handling(self, tool: ScreenshotTool) -> None:
+    @pytest.mark.mock_heavy
+    @pytest.mark.xdist_group("playwright")
+    async def test_timeout_error_handling(
+        self,
+        workspace_tool: ScreenshotTool,
+        patched_playwright: PlaywrightMocks,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
         """Timeout errors should be caught and reported."""
-        mock_page, mock_browser, _, mock_async_playwright_cm = _create_playwright_mocks()
+        page, _, _ = patched_playwright
         
         # Create a custom timeout exception
         class PlaywrightTimeout(Exception):
             pass
         
-        mock_page.goto = AsyncMock(side_effect=PlaywrightTimeout("Page load timed out"))
-        
-        mock_playwright_module = MagicMock()
-        mock_playwright_module.async_playwright = MagicMock(return_value=mock_async_playwright_cm)
-        mock_playwright_module.TimeoutError = PlaywrightTimeout
+        page.goto_error = PlaywrightTimeout("Page load timed out")
+        monkeypatch.setattr(_FAKE_PW, "TimeoutError", PlaywrightTimeout)
         
-        with patch.dict("sys.modules", {"playwright.async_api": mock_playwright_module}):
-            result = await tool.execute(url="https://slow-site.example.com")
+        result = await workspace_tool.execute(url="https://slow-site.example.com")
         
         assert "Error" in result
         assert "timed out" in result.lower()
 
-    def test_url_with_special_characters(self) -> None:
-        """URLs with special characters should be handled."""
-        url = "https://example.com/path?query=hello%20world&foo=bar#section"
+    @pytest.mark.parametrize(
+        "url",
+        [
+            pytest.param(
+                "https://example.com/path?query=hello%20world&foo=bar#section",
+                id="special",
+                marks=pytest.mark.fast,
+            ),
+            pytest.param("https://localhost:3000/api", id="port", marks=pytest.mark.fast),
+            pytest.param("http://192.168.1.1:8080", id="ipv4", marks=pytest.mark.fast),
+        ],
+    )
+    def test_valid_urls(self, url: str) -> None:
+        """URLs with query strings, ports and IPv4 hosts should be valid."""
         is_valid, error = _validate_url(url)
         assert is_valid is True
-
-    def test_url_with_port(self) -> None:
-        """URLs with port numbers should be valid."""
-        is_valid, error = _validate_url("https://localhost:3000/api")
-        assert is_valid is True
-
-    def test_url_with_ipv4(self) -> None:
-        """URLs with IPv4 addresses should be valid."""
-        is_valid, error = _validate_url("http://192.168.1.1:8080")
-        assert is_valid is True
+        assert error == ""
@@ -5,6 +5,7 @@ Uses stdio transport for JSON-RPC communication.
 """
 
 import asyncio
+import time
 from datetime import datetime
 from mcp.server import Server
 from mcp.server.stdio import stdio_server
@@ -15,68 +16,91 @@ import mcp.types as types
 server = Server("test-calculator")
 
 
+# Tool definitions are static; build them once
+_TOOLS: list[Tool] = [
+    Tool(
+        name="add",
+        description="Add two numbers together",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "a": {"type": "number", "description": "First number"},
+                "b": {"type": "number", "description": "Second number"},
+            },
+            "required": ["a", "b"],
+        },
+    ),
+    Tool(
+        name="multiply",
+        description="Multiply two numbers together",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "a": {"type": "number", "description": "First number"},
+                "b": {"type": "number", "description": "Second number"},
+            },
+            "required": ["a", "b"],
+        },
+    ),
+    Tool(
+        name="get_time",
+        description="Get the current timestamp",
+        inputSchema={
+            "type": "object",
+            "properties": {},
+            "required": [],
+        },
+    ),
+]
+
+
 @server.list_tools()
 async def list_tools() -> list[Tool]:
     """Return the list of available tools."""
-    return [
-        Tool(
-            name="add",
-            description="Add two numbers together",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "a": {"type": "number", "description": "First number"},
-                    "b": {"type": "number", "description": "Second number"},
-                },
-                "required": ["a", "b"],
-            },
-        ),
-        Tool(
-            name="multiply",
-            description="Multiply two numbers together",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "a": {"type": "number", "description": "First number"},
-                    "b": {"type": "number", "description": "Second number"},
-                },
-                "required": ["a", "b"],
-            },
-        ),
-        Tool(
-            name="get_time",
-            description="Get the current timestamp",
-            inputSchema={
-                "type": "object",
-                "properties": {},
-                "required": [],
-            },
-        ),
-    ]
+    return _TOOLS
+
+
+async def _add(arguments: dict) -> list[TextContent]:
+    a = arguments.get("a", 0)
+    b = arguments.get("b", 0)
+    return [TextContent.model_construct(type="text", text=f"{a} + {b} = {a + b}")]
+
+
+async def _multiply(arguments: dict) -> list[TextContent]:
+    a = arguments.get("a", 0)
+    b = arguments.get("b", 0)
+    return [TextContent.model_construct(type="text", text=f"{a} * {b} = {a * b}")]
+
+
+# Last formatted timestamp, reused for calls within the same millisecond
+_last_time_ns = 0
+_last_timestamp = ""
+
+
+async def _get_time(arguments: dict) -> list[TextContent]:
+    global _last_time_ns, _last_timestamp
+    now_ns = time.time_ns()
+    if now_ns - _last_time_ns >= 1_000_000:
+        _last_timestamp = datetime.fromtimestamp(now_ns / 1e9).isoformat()
+        _last_time_ns = now_ns
+    return [TextContent(type="text", text=f"Current time: {_last_timestamp}")]
+
+
+# Tool name -> handler
+_DISPATCH = {
+    "add": _add,
+    "multiply": _multiply,
+    "get_time": _get_time,
+}
 
 
 @server.call_tool()
 async def call_tool(name: str, arguments: dict) -> list[TextContent]:
     """Execute a tool and return the result."""
-    if name == "add":
-        a = arguments.get("a", 0)
-        b = arguments.get("b", 0)
-        result = a + b
-        return [TextContent(type="text", text=f"{a} + {b} = {result}")]
-
-    elif name == "multiply":
-        a = arguments.get("a", 0)
-        b = arguments.get("b", 0)
-        result = a * b
-        return [TextContent(type="text", text=f"{a} * {b} = {result}")]
-
-    elif name == "get_time":
-        now = datetime.now()
-        timestamp = now.isoformat()
-        return [TextContent(type="text", text=f"Current time: {timestamp}")]
-
-    else:
+    handler = _DISPATCH.get(name)
+    if handler is None:
         raise ValueError(f"Unknown tool: {name}")
+    return await handler(arguments)
 
 
 async def main():